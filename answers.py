@@ -0,0 +1,151 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from profiles import Profile, value_and_derivative
+from quadrature import integrate
+from riemann import evaluate
+
+# answer keys for the problems in documents/paper.tex, and for variants of
+# them with other parameters, every number from quadrature.integrate with its
+# error bound:
+#
+#   the vase, f(y) = cos(y - shift) + offset revolved around the y-axis on
+#   [0, height]. (a) the water it holds, by discs (or, with walls of
+#   thickness wall, by washers: the water inside f - wall, and the material
+#   between f - wall and f), against capacity. (b) its surface area, by
+#   frustums
+#
+#   gabriel's horn, 1/x^power revolved around the x-axis on [1, infinity).
+#   (a) its surface area, (b) its volume, (c) whether it can be painted
+#
+#     python answers.py > documents/answers.tex
+#     python answers.py --vase 2,6,0 --vase 2.5,6,0.1 --horn 1 --horn 1.5
+
+# pi * integral of (f^2 - g^2), discs without g, washers with it
+def volume(profile, a, b, inner = None, **options):
+    if inner is None:
+        integrand = lambda x: np.pi * evaluate(profile, x) ** 2
+    else:
+        integrand = lambda x: np.pi * (evaluate(profile, x) ** 2 - evaluate(inner, x) ** 2)
+    return integrate(integrand, a, b, **options)
+
+# 2 pi * integral of f sqrt(1 + f'^2), what the frustums converge to, with
+# the profile's own f' (dual numbers without one)
+def surface_area(profile, a, b, **options):
+    def integrand(x):
+        values, slopes = value_and_derivative(profile, x)
+        return 2 * np.pi * np.abs(values) * np.sqrt(1 + slopes ** 2)
+    return integrate(integrand, a, b, **options)
+
+def vase_profile(offset = 2, shift = 1):
+    return Profile(lambda y: np.cos(y - shift) + offset)
+
+def horn_profile(power = 1):
+    return Profile(lambda x: x ** -power)
+
+# (offset, height, wall), the first one is the paper's
+VASE_VARIANTS = [(2, 6, 0), (2, 5, 0), (2.5, 6, 0), (2, 6, 0.1), (3, 4, 0.25)]
+HORN_VARIANTS = [1, 0.75, 1.5, 2]
+
+# a result as LaTeX: the value and its error bound, infinity for a divergent
+# integral
+def format_result(result, digits = 6):
+    if result.diverges:
+        return r"$\infty$ (diverges)"
+    if not result.converged:
+        return rf"$\approx {result.value:.{digits}f}$ (did not converge, error $\le {result.error:.1e}$)"
+    return rf"${result.value:.{digits}f}$ (error $\le {result.error:.1e}$)"
+
+def vase_answers(offset, height, wall = 0, capacity = 80):
+    outer = vase_profile(offset)
+    if wall:
+        inner = vase_profile(offset - wall)
+        water = volume(inner, 0, height)
+        material = volume(outer, 0, height, inner)
+    else:
+        water = volume(outer, 0, height)
+        material = None
+    area = surface_area(outer, 0, height)
+
+    title = rf"$f(y)=\cos(y-1)+{offset:g}$ on $[0,{height:g}]$"
+    if wall:
+        title += rf", walls ${wall:g}$ thick"
+    holds = "Yes" if water.value >= capacity else "No"
+    lines = [rf"\item[(a)] Water held: {format_result(water)}. {holds}, it holds {'at least' if holds == 'Yes' else 'less than'} ${capacity:g}$ cubic meters."]
+    if material is not None:
+        lines.append(rf"Material in the walls (washers): {format_result(material)}.")
+    lines.append(rf"\item[(b)] Surface area: {format_result(area)}.")
+    return title, lines
+
+def horn_answers(power = 1):
+    horn = horn_profile(power)
+    area = surface_area(horn, 1, np.inf)
+    inside = volume(horn, 1, np.inf)
+
+    title = rf"$f(x)=1/x^{{{power:g}}}$ on $[1,\infty)$"
+    lines = [
+        rf"\item[(a)] Surface area: {format_result(area)}.",
+        rf"\item[(b)] Volume: {format_result(inside)}.",
+    ]
+    if area.diverges and not inside.diverges:
+        paint = "No, not its surface: that would take infinitely much paint. Yet the horn holds only a finite amount, which could be poured in to coat the inside."
+    elif area.diverges:
+        paint = "No, the surface area and the volume are both infinite."
+    else:
+        paint = "Yes, the surface area is finite."
+    lines.append(rf"\item[(c)] {paint}")
+    return title, lines
+
+def answer_key(vases = VASE_VARIANTS, horns = HORN_VARIANTS, capacity = 80):
+    sections = []
+    for offset, height, wall in vases:
+        sections.append(vase_answers(offset, height, wall, capacity))
+    for power in horns:
+        sections.append(horn_answers(power))
+
+    body = []
+    for title, lines in sections:
+        body.append(rf"\subsection*{{{title}}}")
+        body.append(r"\begin{itemize}[topsep=0pt]")
+        body.extend("\t" + line for line in lines)
+        body.append(r"\end{itemize}")
+    return "\n".join([
+        r"\documentclass{article}",
+        "",
+        r"\usepackage[letterpaper, margin=0.6in, bottom=1in]{geometry}",
+        r"\usepackage{amsmath, amsfonts, amsthm, amssymb}",
+        r"\usepackage{enumitem}",
+        r"\usepackage{mlmodern}",
+        "",
+        r"\begin{document}",
+        r"\section*{Answer Key}",
+        *body,
+        r"\end{document}",
+        "",
+    ])
+
+def _numbers(text):
+    return [float(part) for part in text.split(",")]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write the answer key for the worksheet problems (and variants) as LaTeX.")
+    parser.add_argument("--vase", action="append", type=_numbers, metavar="OFFSET,HEIGHT[,WALL]", help="a vase variant (default: a batch including the paper's 2,6)")
+    parser.add_argument("--horn", action="append", type=float, metavar="POWER", help="a horn variant, 1/x^POWER (default: a batch including the paper's 1)")
+    parser.add_argument("--capacity", type=float, default=80, help="cubic meters of water the vase should hold")
+    parser.add_argument("--out", help="file to write (default: stdout)")
+    args = parser.parse_args()
+
+    vases = [tuple(numbers) + (0,) * (3 - len(numbers)) for numbers in args.vase] if args.vase else VASE_VARIANTS
+    horns = args.horn or ([] if args.vase else HORN_VARIANTS)
+    start = time.perf_counter()
+    key = answer_key(vases, horns, args.capacity)
+    elapsed = time.perf_counter() - start
+    if args.out:
+        with open(args.out, "w") as file:
+            file.write(key)
+    else:
+        sys.stdout.write(key)
+    print(f"{len(vases) + len(horns)} variants in {elapsed * 1000:.1f} ms", file=sys.stderr)
@@ -0,0 +1,51 @@
+import weakref
+
+import numpy as np
+
+# for axes with linear scaling (every axes in the scenes) axes.c2p is
+#     origin + x * x_unit + y * y_unit + z * z_unit
+# so AxesMap works out origin and the units with one c2p call and then maps
+# whole arrays of coordinates with one matrix multiply, instead of c2p going
+# through every number line for every point. one extra point is checked
+# against c2p, and axes that aren't linear (log scaled) are left to c2p.
+#
+# the map is only right for where the axes were when it was made, so
+# axes_map keeps one per axes and makes a new one when they move
+
+# any point off the axes' lines works
+_probe = np.array([0.3711, -1.4142, 2.7183])
+
+class AxesMap:
+    def __init__(self, axes):
+        coords = np.vstack([np.zeros(3), np.eye(3), _probe])
+        points = np.asarray(axes.c2p(coords), dtype=float).reshape(-1, 3)
+        self.origin = points[0]
+        self.units = points[1:4] - self.origin
+        self.linear = np.allclose(self.origin + _probe @ self.units, points[4], rtol = 1e-9, atol = 1e-9)
+        # a closure rather than the axes themselves, like SurfaceOfRevolution
+        self._c2p = None if self.linear else (lambda coords: axes.c2p(coords))
+
+    # coords has shape (..., 2) or (..., 3), returns (..., 3)
+    def __call__(self, coords):
+        coords = np.asarray(coords, dtype=float)
+        if self.linear:
+            return self.origin + coords @ self.units[:coords.shape[-1]]
+        flat = coords.reshape(-1, coords.shape[-1])
+        points = np.asarray(self._c2p(flat), dtype=float).reshape(-1, 3)
+        return points.reshape(*coords.shape[:-1], 3)
+
+# everything c2p depends on: where each number line is and what it covers
+def axes_state(axes):
+    return b"".join(
+        np.concatenate([axis.get_start(), axis.get_end(), np.asarray(axis.x_range[:2], dtype=float)]).tobytes()
+        for axis in axes.get_axes()
+    )
+
+_maps = weakref.WeakKeyDictionary()
+
+def axes_map(axes):
+    state = axes_state(axes)
+    cached = _maps.get(axes)
+    if cached is None or cached[0] != state:
+        cached = _maps[axes] = (state, AxesMap(axes))
+    return cached[1]
@@ -1,26 +1,36 @@
 from manim import *
-import math
 
-weirdfunc = lambda x: (2 * math.log(2, math.e) * math.exp(math.sin(x))) / math.log(x + 2, math.e)
+from axesmap import axes_map
+from profiles import PROFILES
+from revolution import SurfaceOfRevolution
+from riemann import refinement_cache
+from segments import SegmentedScene
+from slices import MorphSlices, RiemannRectangles, c2p_many, gen_cylinders, pixel_size
+from sumlabels import show_sums, sum_label
+from volumes import refinement_steps, riemann_sums
+
+weirdfunc = PROFILES["disc"]
 
 PEDDIE_BLUE = RGBA.from_rgb([24, 52, 83])
 PEDDIE_GOLD = RGBA.from_rgb([204, 152, 0])
 
-class Disc(ThreeDScene):
+class Disc(SegmentedScene):
     # x's and y's in terms of axes coordinates
     def gen_rectangle(self, axes, x1, y1, x2, y2, color):
-        point1 = axes.c2p(x1, y1)
-        point2 = axes.c2p(x2, y2)
+        point1, point2, center = axes_map(axes)([[x1, y1], [x2, y2], [(x1 + x2) / 2, (y1 + y2) / 2]])
         height = abs(point2[1] - point1[1])
         width = abs(point2[0] - point1[0])
         rect = Rectangle(height = height, width = width, color = color)
         rect.set_fill(color, 0.5)
-        rect.move_to(axes.c2p((x1 + x2) / 2, (y1 + y2) / 2))
+        rect.move_to(center)
         return rect
 
     def gen_x_axis_parallel_cylinder(self, axes, center_x, center_y, center_z, radius, height, color):
-        face1 = axes.c2p(center_x - height / 2, center_y, center_z)
-        face2 = axes.c2p(center_x + height / 2, center_y, center_z)
+        face1, face2, center = axes_map(axes)([
+            [center_x - height / 2, center_y, center_z],
+            [center_x + height / 2, center_y, center_z],
+            [center_x, center_y, center_z],
+        ])
         real_height = abs(face2[0] - face1[0])
 
         cylinder = Cylinder(
@@ -31,39 +41,59 @@ class Disc(ThreeDScene):
             stroke_color = PEDDIE_GOLD,
             stroke_width = 1
         )
-        cylinder.move_to(axes.c2p(center_x, center_y, center_z))
+        cylinder.move_to(center)
         return cylinder
     
-    def gen_x_cylinder_riemann(self, function, a, b, subintervals, axes):
-        dx = (b - a) / subintervals
-        cylinders = []
-        for i in range(subintervals):
-            xi = a + i * dx
-            # color = PEDDIE_BLUE if i % 2 == 0 else PEDDIE_GOLD
-            color = YELLOW_D
-            cylinder = self.gen_x_axis_parallel_cylinder(
-                axes, xi + dx / 2, 0, 0,
-                function(xi + dx), dx, color
+    # gen_x_axis_parallel_cylinder for a whole array of slices at once.
+    # into=a merged solid from here reshapes it in place
+    def gen_x_axis_parallel_cylinders(self, axes, centers_x, radii, heights, color, merged = False, into = None):
+        zeros = np.zeros_like(centers_x)
+        face1 = c2p_many(axes, np.column_stack([centers_x - heights / 2, zeros, zeros]))
+        face2 = c2p_many(axes, np.column_stack([centers_x + heights / 2, zeros, zeros]))
+        real_heights = np.abs(face2[:, 0] - face1[:, 0])
+
+        return gen_cylinders(
+            c2p_many(axes, np.column_stack([centers_x, zeros, zeros])),
+            radii, real_heights,
+            direction = X_AXIS,
+            fill_color = color,
+            stroke_color = PEDDIE_GOLD,
+            stroke_width = 1,
+            zoom = self.camera.get_zoom(),
+            merged = merged,
+            into = into
+        )
+
+    # subintervals can be fractional with count slices, and into reshapes a
+    # solid from here in place, for sweeps driven by a ValueTracker (see
+    # slices.tracker_updater)
+    def gen_x_cylinder_riemann(self, function, a, b, subintervals, axes, count = None, into = None):
+        slices = refinement_cache.slices(function, a, b, subintervals, count = count, keep = into is None)
+        if into is not None:
+            return self.gen_x_axis_parallel_cylinders(
+                axes, slices.centers, slices.radii, slices.heights, None, into = into
             )
-            cylinder.set_opacity(0.5)
-            cylinders.append(cylinder)
-        return Group(*cylinders)
+        # color = [PEDDIE_BLUE if i % 2 == 0 else PEDDIE_GOLD for i in range(subintervals)]
+        color = YELLOW_D
+        cylinders = self.gen_x_axis_parallel_cylinders(
+            axes, slices.centers, slices.radii, slices.heights, color, merged = True
+        )
+        cylinders.set_opacity(0.5)
+        return cylinders
 
+    # every rectangle in one mobject, rects.rectangle(i) for just one
     def gen_riemann(self, function, a, b, subintervals, axes):
-        dx = (b - a) / subintervals
-        rects = []
-        for i in range(subintervals):
-            xi = a + i * dx
-            rect = self.gen_rectangle(axes, xi, 0, xi + dx, function(xi + dx), BLUE_E)
-            rects.append(rect)
-        return rects
+        slices = refinement_cache.slices(function, a, b, subintervals)
+        return RiemannRectangles(axes, slices.left, slices.right, slices.right_values, BLUE_E)
 
     def construct(self):
+        self.next_segment("title")
         text = Tex("Disc Method").scale(2)
         self.play(Write(text))
         self.wait(1)
         self.play(Unwrite(text))
 
+        self.next_segment("graph", weirdfunc)
         axes = ThreeDAxes(
             x_range = [0, 6],
             y_range = [-4, 4],
@@ -76,6 +106,7 @@ class Disc(ThreeDScene):
         function_plot = axes.plot(
             weirdfunc,
             x_range = [0, 5],
+            use_vectorized = True,
             color = BLUE
         )
 
@@ -93,16 +124,14 @@ class Disc(ThreeDScene):
             Write(label)
         )
 
-        # comment to remove rendering solid
+        self.next_segment("solid", weirdfunc)
         self.wait(2)
 
         self.move_camera(phi=75 * DEGREES, theta=30 * DEGREES, zoom=1, run_time=1.5)
         self.begin_ambient_camera_rotation(rate=0.15)
 
-        surface = Surface(
-            lambda u, v: axes.c2p(
-                v, weirdfunc(v) * np.cos(u), weirdfunc(v) * np.sin(u)
-            ),
+        surface = SurfaceOfRevolution(
+            axes, weirdfunc,
             u_range = [0, 2 * PI],
             v_range = [0, 5],
             fill_color = RED
@@ -124,8 +153,8 @@ class Disc(ThreeDScene):
 
         self.play(Uncreate(surface))
         self.wait(2)
-        # end comment to remove rendering solid
 
+        self.next_segment("area", weirdfunc)
         integral_text = MathTex("A=\\int_{a}^{b} f(x)\\,\\mathrm dx", color=BLUE)
         integral_text.next_to(axes.coords_to_point(2.5, 0), DOWN, buff=0.2)
         integral_text.shift(RIGHT)
@@ -136,11 +165,11 @@ class Disc(ThreeDScene):
         riemann_text.next_to(integral_text, DOWN, buff=0.2)
 
         riemann_rects = self.gen_riemann(weirdfunc, 0, 5, 5, axes)
-        particular_rect = riemann_rects[1]
+        particular_rect = riemann_rects.rectangle(1)
         particular_rect_under_brace = BraceLabel(particular_rect, r"\Delta x")
         particular_rect_right_brace = BraceLabel(particular_rect, r"f(x_i)", brace_direction=RIGHT)
 
-        riemann = Group(*riemann_rects)
+        riemann = riemann_rects
         self.play(
             FadeIn(riemann),
             Write(riemann_text)
@@ -151,25 +180,34 @@ class Disc(ThreeDScene):
             Write(particular_rect_right_brace)
         )
 
-        # comment to remove riemann animation
+        self.next_segment("area_refinement", weirdfunc, show_sums())
         self.wait(1)
         self.remove(riemann)
-        for i in range(6, 62, 5):
+        refinement = refinement_steps(weirdfunc, 0, 5, "area", 5, range(6, 62, 5), pixel_size(axes, self.camera.get_zoom()))
+        if show_sums():
+            # every sum in the montage, worked out at once
+            areas = dict(zip([5, *refinement], riemann_sums(weirdfunc, 0, 5, [5, *refinement], "area")))
+            area_label = sum_label(areas[5], riemann_text)
+            self.play(FadeIn(area_label))
+        for i in refinement:
             riemann_rects_new = self.gen_riemann(weirdfunc, 0, 5, i, axes)
-            riemann_new = Group(*riemann_rects_new)
+            riemann_new = riemann_rects_new
             riemann_text_new = MathTex("A\\approx \\sum_{i=1}^{" + str(i) + "}f(x_i)\\Delta x", color=YELLOW_B)
             riemann_text_new.next_to(integral_text, DOWN, buff=0.2)
 
-            particular_rect_new = riemann_rects_new[i // 5]
+            particular_rect_new = riemann_rects_new.rectangle(i // 5)
             particular_rect_under_brace_new = BraceLabel(particular_rect_new, r"\Delta x")
             particular_rect_right_brace_new = BraceLabel(particular_rect_new, r"f(x_i)", brace_direction=RIGHT)
+            sum_labels = [Transform(area_label, sum_label(areas[i], riemann_text_new))] if show_sums() else []
 
             self.play(ChangeSpeed(AnimationGroup(
-                Transform(riemann, riemann_new), 
+                MorphSlices(riemann, riemann_new), 
                 Transform(riemann_text, riemann_text_new),
                 Transform(particular_rect_under_brace, particular_rect_under_brace_new),
                 Transform(particular_rect_right_brace, particular_rect_right_brace_new),
+                *sum_labels,
             ), speedinfo={0: 2 if i < 25 else 5}, rate_func=linear))
+            riemann = riemann_new
             self.wait(0.1)
 
         riemann_text_new = MathTex("A=\\lim_{n\\to\\infty} \\sum_{i=1}^{n}f(x_i)\\Delta x", color=YELLOW_B)
@@ -178,24 +216,26 @@ class Disc(ThreeDScene):
             Transform(riemann_text, riemann_text_new),
             FadeOut(particular_rect_under_brace),
             FadeOut(particular_rect_right_brace),
+            *([FadeOut(area_label)] if show_sums() else []),
         )
-        # end comment to remove riemann animation
 
+        self.next_segment("ten_rectangles", weirdfunc)
         self.wait(2)
 
         riemann_rects_new = self.gen_riemann(weirdfunc, 0, 5, 10, axes)
-        riemann_new = Group(*riemann_rects_new)
+        riemann_new = riemann_rects_new
         riemann_text_new = MathTex("A \\approx \\sum_{i=1}^{10}f(x_i)\\Delta x", color=YELLOW_B)
         riemann_text_new.next_to(integral_text, DOWN, buff=0.2)
 
-        particular_rect_new = riemann_rects_new[2]
+        particular_rect_new = riemann_rects_new.rectangle(2)
         particular_rect_under_brace_new = BraceLabel(particular_rect_new, r"\Delta x")
         particular_rect_right_brace_new = BraceLabel(particular_rect_new, r"f(x_i)", brace_direction=RIGHT)
 
         self.play(
-            Transform(riemann, riemann_new), 
+            MorphSlices(riemann, riemann_new), 
             Transform(riemann_text, riemann_text_new),
         )
+        riemann = riemann_new
         self.wait(0.5)
         self.play(
             Write(particular_rect_under_brace_new),
@@ -210,15 +250,15 @@ class Disc(ThreeDScene):
         self.move_camera(phi=60 * DEGREES, theta=30 * DEGREES, zoom=1, run_time=1.5)
         self.begin_ambient_camera_rotation(rate=0.25)
 
-        # comment to remove discs
+        self.next_segment("discs", weirdfunc)
         self.wait(0.5)
         cylinders = self.gen_x_cylinder_riemann(weirdfunc, 0, 5, 10, axes)
         riemann_copy = riemann.copy()
         self.add(riemann_copy)
-        self.play(Transform(riemann, cylinders))
-
-        # end comment to remove discs
+        self.play(MorphSlices(riemann, cylinders))
+        riemann = cylinders
 
+        self.next_segment("disc_volume")
         self.wait(2)
         self.move_camera(phi=60 * DEGREES, theta=30 * DEGREES + 0.25 * (2 + 0.5), zoom=0.6, run_time=1.5, frame_center=[0, 0, 3])
             
@@ -272,19 +312,33 @@ class Disc(ThreeDScene):
 
         self.wait(2)
 
-        for i in range(11, 62, 5):
+        self.next_segment("disc_refinement", weirdfunc, show_sums())
+        refinement = refinement_steps(weirdfunc, 0, 5, "disc", 10, range(11, 62, 5), pixel_size(axes, self.camera.get_zoom()))
+        if show_sums():
+            volumes = dict(zip([10, *refinement], riemann_sums(weirdfunc, 0, 5, [10, *refinement], "disc")))
+            volume_label = sum_label(volumes[10], disc_info4)
+            self.add_fixed_in_frame_mobjects(volume_label)
+            self.play(FadeIn(volume_label))
+        for i in refinement:
             cylinders_new = self.gen_x_cylinder_riemann(weirdfunc, 0, 5, i, axes)
             disc_info4_new = MathTex(r"\text{Volume}\approx \sum_{i=1}^{" + str(i) + r"} \pi (f(x_i))^2 \Delta x")
             disc_info4_new.scale(0.8)
             disc_info4_new.move_to(disc_info4)
+            sum_labels = [Transform(volume_label, sum_label(volumes[i], disc_info4_new))] if show_sums() else []
 
             self.play(ChangeSpeed(AnimationGroup(
-                Transform(riemann, cylinders_new),
-                Transform(disc_info4, disc_info4_new)
+                MorphSlices(riemann, cylinders_new),
+                Transform(disc_info4, disc_info4_new),
+                *sum_labels,
             ), speedinfo={0: 2 if i < 25 else 5}, rate_func=linear))
+            riemann = cylinders_new
 
             self.wait(0.2)
 
+        if show_sums():
+            self.play(FadeOut(volume_label))
+
+        self.next_segment("volume_integral")
         self.wait(1)
         
         skibidi = MathTex(r"V=\lim_{n\to\infty} \sum_{i=1}^{n}\pi(f(x_i))^2\Delta x")
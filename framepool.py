@@ -0,0 +1,182 @@
+import hashlib
+import multiprocessing
+import os
+from pathlib import Path
+import shutil
+
+from manim import *
+from manim.utils.family import extract_mobject_family_members
+import numpy as np
+from PIL import Image
+
+# a wait during an ambient camera rotation redraws the same mobjects from a
+# slightly different angle every frame. the camera angles are worked out in
+# the scene's own process by stepping the updaters exactly like a normal
+# render would, then the frames are drawn by forked copies of the scene, a
+# chunk each, and written back in order.
+#
+# the 3d surfaces (everything shaded in 3d) are always drawn first, below the
+# axes, labels and text, so they're drawn as their own layer and kept on
+# disk as a "turntable": media_dir/turntables/<key>/<frame>.png, the key
+# hashing the surfaces' points and colors, the camera value of every frame,
+# the frame center, the lighting and the quality. the next time the same
+# surfaces are orbited the same way (a re-render, or a change to some text)
+# only the flat layer on top gets drawn.
+#
+# a turntable is a full size png per frame, around a gigabyte for an 8 second
+# 1080p orbit, and every change to a surface or the camera path makes a new
+# one. TURNTABLE_CACHE_MB (2048 by default, 0 turns the cache off) caps them
+# all together: after every orbit the least recently used turntables are
+# deleted until the rest fit. deleting media_dir/turntables by hand is always
+# safe, they are only ever a cache
+
+# FRAME_JOBS=1 turns off the worker processes
+def frame_jobs():
+    return int(os.environ.get("FRAME_JOBS", os.cpu_count() or 1))
+
+def turntable_cache_budget():
+    return int(float(os.environ.get("TURNTABLE_CACHE_MB", 2048)) * 2 ** 20)
+
+def turntable_cache_enabled():
+    return not config.disable_caching and turntable_cache_budget() > 0
+
+def turntable_dir():
+    return Path(config.media_dir) / "turntables"
+
+# deletes the least recently used turntables (by the time of the directory,
+# touched whenever one is used) until all of them fit in budget bytes.
+# keep is never deleted
+def prune_turntables(budget, keep = None):
+    directories = [path for path in turntable_dir().iterdir() if path.is_dir()] if turntable_dir().exists() else []
+    sizes = {path: sum(file.stat().st_size for file in path.iterdir() if file.is_file()) for path in directories}
+    total = sum(sizes.values())
+    for path in sorted(directories, key = lambda path: path.stat().st_mtime):
+        if total <= budget:
+            break
+        if path == keep:
+            continue
+        shutil.rmtree(path, ignore_errors = True)
+        total -= sizes[path]
+
+# the scene the workers draw, inherited through fork
+_scene = None
+_trackers = None
+_layers = None
+_turntable = None
+
+def _draw_frames(chunk):
+    renderer = _scene.renderer
+    camera = renderer.camera
+    surfaces, flat = _layers
+    frames = []
+    for index, values in chunk:
+        for tracker, value in zip(_trackers, values):
+            tracker.set_value(value)
+        turntable_file = None if _turntable is None else _turntable / f"{index:05}.png"
+        if turntable_file is not None and turntable_file.exists():
+            camera.pixel_array[:] = np.asarray(Image.open(turntable_file))
+        else:
+            if renderer.static_image is not None:
+                camera.set_frame_to_background(renderer.static_image)
+            else:
+                camera.reset()
+            camera.capture_mobjects(surfaces)
+            if turntable_file is not None:
+                temporary = turntable_file.with_suffix(f".{os.getpid()}.png")
+                Image.fromarray(camera.pixel_array).save(temporary)
+                os.replace(temporary, turntable_file)
+        camera.capture_mobjects(flat)
+        frames.append(renderer.get_frame())
+    return frames
+
+# whether the animations being played are only waits, and nothing but the
+# camera trackers changes over time
+def is_camera_only_wait(scene):
+    if not all(isinstance(animation, Wait) for animation in scene.animations):
+        return False
+    if scene.stop_condition is not None:
+        return False
+    trackers = set(scene.camera.get_value_trackers())
+    updated = [mobject for mobject in scene.get_mobject_family_members() if mobject.get_updaters()]
+    return len(updated) > 0 and set(updated) <= trackers
+
+# the mobjects drawn every frame, split into the ones shaded in 3d and the
+# rest. the camera puts everything shaded in 3d first, depth sorted, so
+# drawing the two lists one after the other gives the same picture
+def split_layers(mobjects):
+    members = extract_mobject_family_members(mobjects, only_those_with_points = True)
+    surfaces = [member for member in members if getattr(member, "shade_in_3d", False)]
+    flat = [member for member in members if not getattr(member, "shade_in_3d", False)]
+    return surfaces, flat
+
+def turntable_key(scene, surfaces, tracker_values):
+    camera = scene.camera
+    digest = hashlib.sha256()
+    for member in surfaces:
+        digest.update(type(member).__name__.encode())
+        for array in (member.points, member.fill_rgbas, member.stroke_rgbas, getattr(member, "background_stroke_rgbas", [])):
+            digest.update(np.ascontiguousarray(array, dtype = float).tobytes())
+        digest.update(repr((member.stroke_width, member in camera.fixed_in_frame_mobjects)).encode())
+    digest.update(np.asarray(tracker_values, dtype = float).tobytes())
+    digest.update(np.asarray(camera.frame_center, dtype = float).tobytes())
+    digest.update(np.asarray(camera.light_source.get_center(), dtype = float).tobytes())
+    if scene.renderer.static_image is not None:
+        digest.update(np.ascontiguousarray(scene.renderer.static_image).tobytes())
+    digest.update(repr((
+        camera.should_apply_shading, config.pixel_width, config.pixel_height,
+        config.frame_width, config.frame_height, str(config.background_color),
+    )).encode())
+    return digest.hexdigest()
+
+# Scene.play_internal for a camera only wait, drawing the frames in jobs
+# processes (or here, if there are too few frames to bother) with the 3d
+# layer taken from the turntable cache when it's there
+def play_camera_wait(scene, jobs = None):
+    global _scene, _trackers, _layers, _turntable
+    jobs = jobs or frame_jobs()
+    if "fork" not in multiprocessing.get_all_start_methods():
+        jobs = 1
+    scene.duration = scene.get_run_time(scene.animations)
+    times = np.arange(0, scene.duration, 1 / config.frame_rate)
+
+    trackers = scene.camera.get_value_trackers()
+    tracker_values = []
+    for t in times:
+        scene.update_to_time(t)
+        tracker_values.append([tracker.get_value() for tracker in trackers])
+    end_values = [tracker.get_value() for tracker in trackers]
+
+    _scene, _trackers = scene, trackers
+    _layers = split_layers(scene.moving_mobjects)
+    _turntable = None
+    if turntable_cache_enabled() and _layers[0]:
+        _turntable = turntable_dir() / turntable_key(scene, _layers[0], tracker_values)
+        _turntable.mkdir(parents = True, exist_ok = True)
+        # most recently used
+        os.utime(_turntable)
+
+    frames = list(enumerate(tracker_values))
+    try:
+        if jobs < 2 or len(frames) < 2 * jobs:
+            for frame in _draw_frames(frames):
+                scene.renderer.add_frame(frame)
+        else:
+            chunk_size = -(-len(frames) // (4 * jobs))
+            chunks = [frames[i:i + chunk_size] for i in range(0, len(frames), chunk_size)]
+            with multiprocessing.get_context("fork").Pool(jobs) as pool:
+                for chunk_frames in pool.imap(_draw_frames, chunks):
+                    for frame in chunk_frames:
+                        scene.renderer.add_frame(frame)
+        if _turntable is not None:
+            prune_turntables(turntable_cache_budget(), keep = _turntable)
+    finally:
+        _scene, _trackers, _layers, _turntable = None, None, None, None
+        for tracker, value in zip(trackers, end_values):
+            tracker.set_value(value)
+
+    for animation in scene.animations:
+        animation.finish()
+        animation.clean_up_from_scene(scene)
+    scene.update_mobjects(0)
+    scene.renderer.static_image = None
+    return True
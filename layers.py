@@ -0,0 +1,112 @@
+import hashlib
+
+from manim import *
+from manim.utils.family import extract_mobject_family_members
+import numpy as np
+
+# manim draws everything that doesn't move once per play (the static image)
+# and only redraws the rest each frame, but "the rest" is everything from the
+# first moving mobject in scene.mobjects onwards. the 3d camera draws things
+# in a different order than that though: everything shaded in 3d first,
+# depth sorted, then the flat mobjects (axes, labels, text) in order. so when
+# only flat mobjects move, the solids and everything flat before the first
+# moving one can all go in the static image, however early or late they were
+# added to the scene.
+#
+# the static image is also kept between plays, so a run of text animations
+# over the same solids only rasterizes the solids once
+
+# the mobjects of the innermost animations, looking inside AnimationGroups
+# and ChangeSpeed
+def _animation_mobjects(animations):
+    mobjects = []
+    for animation in animations:
+        if isinstance(animation, AnimationGroup):
+            mobjects += _animation_mobjects(animation.animations)
+        elif isinstance(animation, ChangeSpeed):
+            mobjects += _animation_mobjects([animation.anim])
+        else:
+            mobjects.append(animation.mobject)
+    return mobjects
+
+# the mobjects to redraw every frame, given what Scene.get_moving_mobjects
+# came up with (moving). only changes anything if every changing mobject is
+# flat and the camera stays put
+def flat_moving_layer(scene, animations, moving):
+    camera = scene.camera
+    camera_mobjects = camera.get_value_trackers() + [camera._frame_center]
+    if any(mobject in moving for mobject in camera_mobjects):
+        return moving
+
+    roots = _animation_mobjects(animations)
+    roots += [mobject for mobject in scene.get_mobject_family_members() if mobject.updaters]
+    roots += list(scene.foreground_mobjects)
+    root_of = {}
+    for root in roots:
+        for member in root.get_family():
+            root_of.setdefault(member, root)
+
+    members = extract_mobject_family_members(
+        list_update(scene.mobjects, scene.foreground_mobjects),
+        use_z_index = camera.use_z_index,
+        only_those_with_points = True,
+    )
+    changing = [member for member in members if member in root_of]
+    if not changing or any(getattr(member, "shade_in_3d", False) for member in changing):
+        return moving
+
+    flat = [member for member in members if not getattr(member, "shade_in_3d", False)]
+    position = {member: i for i, member in enumerate(flat)}
+    first = position[changing[0]]
+
+    # an animated mobject is passed whole when its pieces are drawn one after
+    # the other anyway, since a Transform can still add pieces to it when it
+    # begins. otherwise its pieces are passed one by one
+    layer = []
+    covered = set()
+    for i in range(first, len(flat)):
+        member = flat[i]
+        if member in covered:
+            continue
+        root = root_of.get(member)
+        if root is not None:
+            family = root.family_members_with_points()
+            run = [position.get(piece) for piece in family]
+            if run == list(range(i, i + len(family))) and not covered.intersection(family):
+                layer.append(root)
+                covered.update(family)
+                continue
+        layer.append(member)
+        covered.add(member)
+    return layer
+
+def static_layer_key(scene, static_mobjects):
+    camera = scene.camera
+    digest = hashlib.sha256()
+    for member in extract_mobject_family_members(static_mobjects, only_those_with_points = True):
+        digest.update(type(member).__name__.encode())
+        for array in (member.points, member.fill_rgbas, member.stroke_rgbas, getattr(member, "background_stroke_rgbas", [])):
+            digest.update(np.ascontiguousarray(array, dtype = float).tobytes())
+        digest.update(repr((member.stroke_width, member.z_index, member in camera.fixed_in_frame_mobjects)).encode())
+    digest.update(np.asarray([tracker.get_value() for tracker in camera.get_value_trackers()], dtype = float).tobytes())
+    digest.update(np.asarray(camera.frame_center, dtype = float).tobytes())
+    return digest.hexdigest()
+
+# swaps the renderer's save_static_frame_data for one that reuses the last
+# static image when the static mobjects and the camera haven't changed
+def keep_static_layer(scene):
+    renderer = scene.renderer
+    save_static_frame_data = renderer.save_static_frame_data
+    kept = {"key": None, "image": None}
+
+    def save_kept_static_frame_data(scene, static_mobjects):
+        # nothing real gets drawn while skipping
+        if renderer.skip_animations or not static_mobjects:
+            return save_static_frame_data(scene, static_mobjects)
+        key = static_layer_key(scene, static_mobjects)
+        if key != kept["key"]:
+            kept["key"], kept["image"] = key, save_static_frame_data(scene, static_mobjects)
+        renderer.static_image = kept["image"]
+        return renderer.static_image
+
+    renderer.save_static_frame_data = save_kept_static_frame_data
@@ -0,0 +1,75 @@
+import numpy as np
+
+import dual
+from riemann import evaluate
+
+# a profile is the curve that gets revolved. function, derivative and inverse
+# are all written with numpy so they take a whole array of x's at once
+# (and still work on a single float). without a derivative, f' is worked
+# out from function with dual numbers (see dual.py)
+class Profile:
+    def __init__(self, function, derivative=None, inverse=None):
+        self.function = function
+        # None when f' comes from dual numbers
+        self.given_derivative = derivative
+        self.derivative = derivative or (lambda x: dual.derivative(function, x))
+        # another Profile, or None if the function can't be inverted
+        self.inverse = inverse
+
+    def __call__(self, x):
+        return self.function(x)
+
+    # f(x) and f'(x) together. the derivative it was given wins over dual
+    # numbers, which can't get through numpy functions without a rule in
+    # dual.py (np.maximum, np.where, np.hypot, ...)
+    def value_and_derivative(self, x):
+        if self.given_derivative is None:
+            return dual.value_and_derivative(self.function, x)
+        return evaluate(self.function, x), evaluate(self.given_derivative, x)
+
+# f(x) and f'(x) of a Profile or of any function written with numpy
+def value_and_derivative(function, x):
+    if isinstance(function, Profile):
+        return function.value_and_derivative(x)
+    return dual.value_and_derivative(function, x)
+
+# disc.py and surfacearea.py
+_log_exp_sin = lambda x: (2 * np.log(2) * np.exp(np.sin(x))) / np.log(x + 2)
+disc = Profile(
+    _log_exp_sin,
+    lambda x: _log_exp_sin(x) * (np.cos(x) - 1 / ((x + 2) * np.log(x + 2))),
+)
+
+# shell.py, decreasing on [0, 4] so it can be inverted
+shell = Profile(
+    lambda x: 1.5 * (2.5 / (x + 1) - 0.5),
+    lambda x: -3.75 / (x + 1) ** 2,
+)
+shell_inverse = Profile(
+    lambda y: 2.5 / (y / 1.5 + 0.5) - 1,
+    lambda y: -2.5 / (1.5 * (y / 1.5 + 0.5) ** 2),
+)
+shell.inverse = shell_inverse
+shell_inverse.inverse = shell
+
+# vase problem in documents/paper.tex, revolved around the y-axis on [0, 6]
+vase = Profile(
+    lambda y: np.cos(y - 1) + 2,
+    lambda y: -np.sin(y - 1),
+)
+
+# gabriel's horn, 1/x on [1, infinity)
+horn = Profile(
+    lambda x: 1 / x,
+    lambda x: -1 / x ** 2,
+)
+horn.inverse = horn
+
+PROFILES = {
+    "disc": disc,
+    "surface_area": disc,
+    "shell": shell,
+    "shell_inverse": shell_inverse,
+    "vase": vase,
+    "horn": horn,
+}
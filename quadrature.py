@@ -0,0 +1,177 @@
+from collections import namedtuple
+import math
+
+import numpy as np
+
+from riemann import evaluate
+
+# adaptive Gauss-Kronrod quadrature for the worksheet answers, where the
+# integrals have to be right rather than look right.
+#
+#   converged: error is within the tolerance asked for
+#   diverges: the integral doesn't exist (the tail of an infinite interval
+#       keeps adding the same amount), value is then +-inf
+Quadrature = namedtuple("Quadrature", ["value", "error", "evaluations", "converged", "diverges"])
+
+# the 7 point Gauss / 15 point Kronrod pair (QUADPACK's qk15), positive nodes
+# from the outside in, then 0
+_kronrod_nodes = np.array([
+    0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+    0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+    0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+    0.207784955007898467600689403773245, 0.000000000000000000000000000000000,
+])
+_kronrod_weights = np.array([
+    0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+    0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+    0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+    0.204432940075298892414161999234649, 0.209482141084727828012999174891714,
+])
+_gauss_weights = np.array([
+    0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+    0.381830050505118944950369775488975, 0.417959183673469387755102040816327,
+])
+
+# all 15 nodes on [-1, 1] in order, with both rules' weights on them (the
+# Gauss rule uses every other node)
+NODES = np.concatenate([-_kronrod_nodes[:-1], _kronrod_nodes[::-1]])
+KRONROD_WEIGHTS = np.concatenate([_kronrod_weights[:-1], _kronrod_weights[::-1]])
+GAUSS_WEIGHTS = np.zeros(15)
+GAUSS_WEIGHTS[1:15:2] = np.concatenate([_gauss_weights[:-1], _gauss_weights[::-1]])
+
+_epsilon = np.finfo(float).eps
+_tiny = np.finfo(float).tiny
+
+# the Kronrod estimate and its error on every interval [lo, hi] at once, the
+# error being QUADPACK's (the Gauss / Kronrod difference, scaled by how
+# smooth the integrand looks on the interval)
+def gauss_kronrod(integrand, lo, hi):
+    lo, hi = np.atleast_1d(np.asarray(lo, dtype=float)), np.atleast_1d(np.asarray(hi, dtype=float))
+    center, half = (lo + hi) / 2, (hi - lo) / 2
+    values = evaluate(integrand, center[:, None] + half[:, None] * NODES)
+
+    kronrod = half * (values @ KRONROD_WEIGHTS)
+    gauss = half * (values @ GAUSS_WEIGHTS)
+    absolute = np.abs(half) * (np.abs(values) @ KRONROD_WEIGHTS)
+    mean = kronrod / np.where(half == 0, 1, 2 * half)
+    spread = np.abs(half) * (np.abs(values - mean[:, None]) @ KRONROD_WEIGHTS)
+
+    error = np.abs(kronrod - gauss)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scaled = spread * np.minimum(1, (200 * error / spread) ** 1.5)
+    error = np.where((spread != 0) & (error != 0), scaled, error)
+    error = np.where(absolute > _tiny / (50 * _epsilon), np.maximum(50 * _epsilon * absolute, error), error)
+    # an infinity or nan anywhere makes the interval as bad as it gets
+    error = np.where(np.isfinite(kronrod), error, np.inf)
+    return kronrod, error
+
+# the integral over a finite [a, b]. every round splits, all in one batch,
+# each interval whose error is more than its share of the tolerance, until
+# the errors add up to within max(tolerance, relative_tolerance * |value|)
+# or there would be more than max_intervals
+def integrate_finite(integrand, a, b, tolerance = 1e-10, relative_tolerance = 1e-12, max_intervals = 2000):
+    lo, hi = np.array([a], dtype=float), np.array([b], dtype=float)
+    values, errors = gauss_kronrod(integrand, lo, hi)
+    evaluations = 15
+    while True:
+        value, error = math.fsum(values), math.fsum(errors)
+        target = max(tolerance, relative_tolerance * abs(value))
+        if error <= target:
+            return Quadrature(value, error, evaluations, True, False)
+
+        split = errors * len(errors) > target
+        split[np.argmax(errors)] = True
+        # intervals too narrow to split any more
+        split &= np.abs(hi - lo) > 4 * _epsilon * np.maximum(np.abs(lo), np.abs(hi))
+        if not split.any() or len(lo) + split.sum() > max_intervals:
+            return Quadrature(value, error, evaluations, False, False)
+
+        middle = (lo[split] + hi[split]) / 2
+        new_lo = np.concatenate([lo[split], middle])
+        new_hi = np.concatenate([middle, hi[split]])
+        new_values, new_errors = gauss_kronrod(integrand, new_lo, new_hi)
+        evaluations += 15 * len(new_lo)
+        keep = ~split
+        lo, hi = np.concatenate([lo[keep], new_lo]), np.concatenate([hi[keep], new_hi])
+        values = np.concatenate([values[keep], new_values])
+        errors = np.concatenate([errors[keep], new_errors])
+
+# the integral over [a, b], either end of which can be infinite. an
+# infinite tail is integrated a segment at a time, each twice as long as the
+# last, [a, a + w], [a + w, a + 3w], ... a tail that converges adds less and
+# less each segment, and stops once what the segments so far say is left
+# (if they kept shrinking at the same rate) is within the tolerance. a tail
+# where the last stall_segments segments all add as much as the one before
+# (to within stall_ratio, like 1/x) diverges, but only once the segments are
+# past stall_after times the first one's width from a: before that, a slowly
+# decaying integrand (x e^(-x/200), 1/(1 + (x/1000)^2)) adds more every
+# segment too, until the segments reach the scale it decays on. one that
+# only starts decaying past there is taken for divergent
+def integrate(
+    integrand, a, b,
+    tolerance = 1e-10,
+    relative_tolerance = 1e-12,
+    max_intervals = 2000,
+    max_segments = 256,
+    stall_segments = 8,
+    stall_ratio = 0.999,
+    stall_after = 1e8,
+):
+    if a == b:
+        return Quadrature(0.0, 0.0, 0, True, False)
+    if a > b:
+        result = integrate(integrand, b, a, tolerance, relative_tolerance, max_intervals, max_segments, stall_segments, stall_ratio, stall_after)
+        return result._replace(value = -result.value)
+    if math.isfinite(a) and math.isfinite(b):
+        return integrate_finite(integrand, a, b, tolerance, relative_tolerance, max_intervals)
+    if not math.isfinite(a) and not math.isfinite(b):
+        # both tails from 0
+        halves = [
+            integrate(integrand, a, 0.0, tolerance / 2, relative_tolerance, max_intervals, max_segments, stall_segments, stall_ratio, stall_after),
+            integrate(integrand, 0.0, b, tolerance / 2, relative_tolerance, max_intervals, max_segments, stall_segments, stall_ratio, stall_after),
+        ]
+        return _combine(halves)
+    if not math.isfinite(a):
+        # the tail to the left is the tail to the right of -x
+        return integrate(lambda x: evaluate(integrand, -np.asarray(x)), -b, math.inf, tolerance, relative_tolerance, max_intervals, max_segments, stall_segments, stall_ratio, stall_after)
+
+    width = max(1.0, abs(a))
+    start = a
+    stall_start = a + stall_after * width
+    segments = []
+    contributions = []
+    for _ in range(max_segments):
+        segment = integrate_finite(integrand, start, start + width, tolerance / 4, relative_tolerance, max_intervals)
+        segments.append(segment)
+        contributions.append(abs(segment.value))
+        start, width = start + width, 2 * width
+
+        recent = contributions[-stall_segments - 1:]
+        if start >= stall_start and len(recent) > stall_segments and all(
+            later >= stall_ratio * earlier and later > 0 for earlier, later in zip(recent, recent[1:])
+        ):
+            total = math.fsum(segment.value for segment in segments)
+            return Quadrature(math.copysign(math.inf, total), math.inf, sum(segment.evaluations for segment in segments), False, True)
+
+        if len(contributions) >= 3:
+            ratio = contributions[-1] / contributions[-2] if contributions[-2] > 0 else 0.0
+            if ratio < 1:
+                remainder = contributions[-1] * ratio / (1 - ratio)
+                result = _combine(segments)
+                if remainder <= max(tolerance, relative_tolerance * abs(result.value)) / 2:
+                    return result._replace(error = result.error + remainder)
+
+    return _combine(segments)._replace(converged = False)
+
+def _combine(results):
+    value = math.fsum(result.value for result in results)
+    error = math.fsum(result.error for result in results)
+    diverges = any(result.diverges for result in results)
+    if diverges:
+        value = math.copysign(math.inf, value) if math.isfinite(value) else value
+    return Quadrature(
+        value, error,
+        sum(result.evaluations for result in results),
+        all(result.converged for result in results),
+        diverges,
+    )
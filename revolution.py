@@ -0,0 +1,143 @@
+from functools import lru_cache
+
+from manim import *
+import numpy as np
+
+from axesmap import axes_map
+from riemann import evaluate
+
+# cos/sin of every angle on the u grid, shared by every surface with the same
+# angular range and resolution
+@lru_cache(maxsize=None)
+def angle_table(u_min, u_max, segments):
+    u_values = np.linspace(u_min, u_max, segments + 1)
+    cos_u, sin_u = np.cos(u_values), np.sin(u_values)
+    for array in (u_values, cos_u, sin_u):
+        array.flags.writeable = False
+    return u_values, cos_u, sin_u
+
+# same corners -> cubic bezier points as VMobject.set_points_as_corners, for a
+# whole array of faces at once. corners has shape (..., 5, 3)
+def corners_to_points(corners):
+    start, end = corners[..., :-1, :], corners[..., 1:, :]
+    points = np.stack([interpolate(start, end, alpha) for alpha in np.linspace(0, 1, 4)], axis=-2)
+    return points.reshape(*corners.shape[:-2], -1, 3)
+
+# grid[..., j, i] is the point at (u_values[i], v_values[j]). returns the points
+# of face (i, j) at [..., j, i], with the corners in the same order as Surface
+def grid_to_face_points(grid):
+    corners = np.stack([
+        grid[..., :-1, :-1, :], grid[..., :-1, 1:, :], grid[..., 1:, 1:, :], grid[..., 1:, :-1, :], grid[..., :-1, :-1, :]
+    ], axis=-2)
+    return corners_to_points(corners)
+
+# Surface(lambda u, v: axes.c2p(v, f(v) * cos(u), f(v) * sin(u))) but f is
+# evaluated once per ring and cos/sin once per angle, instead of at every
+# point of every face.
+#   axis=X_AXIS: revolve y = f(x) about the x-axis, v is x
+#   axis=Y_AXIS: revolve y = f(x) about the y-axis, v is x (the radius)
+class SurfaceOfRevolution(Surface):
+    def __init__(
+        self,
+        axes,
+        function,
+        v_range,
+        axis = X_AXIS,
+        u_range = [0, 2 * PI],
+        resolution = 32,
+        fill_color = BLUE_D,
+        fill_opacity = 1.0,
+        checkerboard_colors = [BLUE_D, BLUE_E],
+        stroke_color = LIGHT_GREY,
+        stroke_width = 0.5,
+        should_make_jagged = False,
+        **kwargs
+    ):
+        self.profile = function
+        self.axis = np.array(axis)
+        self.u_range = u_range
+        self.v_range = v_range
+        # a closure rather than the axes themselves, so copies don't deepcopy the axes
+        to_scene = axes_map(axes)
+        self._c2p = lambda coords: to_scene(coords)
+        # skip Surface.__init__, it would push every point through func one at a time
+        super(Surface, self).__init__(
+            fill_color = fill_color,
+            fill_opacity = fill_opacity,
+            stroke_color = stroke_color,
+            stroke_width = stroke_width,
+            **kwargs
+        )
+        self.resolution = resolution
+        self.surface_piece_config = {}
+        if checkerboard_colors is False:
+            self.checkerboard_colors = False
+        else:
+            self.checkerboard_colors = [ManimColor(color) for color in checkerboard_colors]
+        self.should_make_jagged = should_make_jagged
+        self.pre_function_handle_to_anchor_scale_factor = 0.00001
+        self.list_of_faces = []
+        self._func = self.func
+        self._setup_in_uv_space()
+        if self.should_make_jagged:
+            self.make_jagged()
+
+    # axes coordinates of the rings at v, one column per (cos u, sin u)
+    def _axes_coords(self, cos_u, sin_u, v):
+        values = evaluate(self.profile, v)
+        if np.array_equal(self.axis, X_AXIS):
+            radius, axial = values, v
+        elif np.array_equal(self.axis, Y_AXIS):
+            radius, axial = v, values
+        else:
+            raise ValueError("SurfaceOfRevolution only revolves about X_AXIS or Y_AXIS")
+        ring_cos, ring_sin = radius * cos_u, radius * sin_u
+        axial = np.broadcast_to(axial, ring_cos.shape)
+        if np.array_equal(self.axis, X_AXIS):
+            return np.stack([axial, ring_cos, ring_sin], axis=-1)
+        return np.stack([ring_cos, axial, ring_sin], axis=-1)
+
+    def func(self, u, v):
+        coords = self._axes_coords(np.cos(u), np.sin(u), np.array([v], dtype=float))
+        return self._c2p(coords).reshape(3)
+
+    def _get_u_values_and_v_values(self):
+        if isinstance(self.resolution, int):
+            u_res = v_res = self.resolution
+        else:
+            u_res, v_res = self.resolution
+        u_values, _, _ = angle_table(float(self.u_range[0]), float(self.u_range[1]), u_res)
+        v_values = np.linspace(*self.v_range, v_res + 1)
+        return u_values, v_values
+
+    def _setup_in_uv_space(self):
+        u_values, v_values = self._get_u_values_and_v_values()
+        _, cos_u, sin_u = angle_table(float(self.u_range[0]), float(self.u_range[1]), len(u_values) - 1)
+
+        # grid[j, i] is the point at (u_values[i], v_values[j])
+        coords = self._axes_coords(cos_u[None, :], sin_u[None, :], v_values[:, None])
+        grid = self._c2p(coords)
+
+        face_points = grid_to_face_points(grid)
+
+        faces = VGroup()
+        self.list_of_faces = []
+        for i in range(len(u_values) - 1):
+            for j in range(len(v_values) - 1):
+                face = ThreeDVMobject()
+                face.set_points(face_points[j, i])
+                faces.add(face)
+                face.u_index = i
+                face.v_index = j
+                face.u1, face.u2 = u_values[i : i + 2]
+                face.v1, face.v2 = v_values[j : j + 2]
+                self.list_of_faces.append(face)
+        faces.set_fill(color=self.fill_color, opacity=self.fill_opacity)
+        faces.set_stroke(
+            color=self.stroke_color,
+            width=self.stroke_width,
+            opacity=self.stroke_opacity,
+        )
+        self.add(*faces)
+        if self.checkerboard_colors:
+            self.set_fill_by_checkerboard(*self.checkerboard_colors)
@@ -0,0 +1,133 @@
+from collections import OrderedDict, namedtuple
+import math
+import numpy as np
+
+# every array has one entry per slice, in axes coordinates
+RiemannSlices = namedtuple("RiemannSlices", [
+    "left", "right", "centers", "width",
+    "left_values", "right_values",
+    "radii", "heights",
+])
+
+# evaluate function over a whole array, falling back to one call per point
+# for scalar-only functions (math.log etc.)
+def evaluate(function, x):
+    x = np.asarray(x, dtype=float)
+    try:
+        values = np.asarray(function(x), dtype=float)
+        if values.shape == x.shape:
+            return values
+    except TypeError:
+        pass
+    return np.fromiter((function(xi) for xi in x.flat), dtype=float, count=x.size).reshape(x.shape)
+
+# method is how the slices get revolved:
+#   "disc": radius is f(right endpoint), height is the slice width
+#   "shell": radius is the right endpoint, height is f(right endpoint)
+#   "frustum": radius is f(left endpoint) (the other end is right_values), height is the slice width
+# values can be passed in if f at the n + 1 edges is already known.
+#
+# subintervals doesn't have to be a whole number, for sweeping n smoothly:
+# the slices are (b - a) / subintervals wide from a, the last one is cut off
+# at b, and there are count of them (ceil(subintervals) by default). slices
+# past b are empty, with zero radius and height, so a solid can be built
+# with the most slices it will ever need and then reshaped in place
+def riemann_slices(function, a, b, subintervals, method="disc", values=None, count=None):
+    if count is None:
+        count = math.ceil(subintervals)
+    if count == subintervals:
+        edges = np.linspace(a, b, count + 1)
+    else:
+        edges = a + np.arange(count + 1) * ((b - a) / subintervals)
+        edges = np.minimum(edges, b) if b >= a else np.maximum(edges, b)
+    if values is None:
+        values = evaluate(function, edges)
+    width = (b - a) / subintervals
+
+    left, right = edges[:-1], edges[1:]
+    left_values, right_values = values[:-1], values[1:]
+    centers = (left + right) / 2 if count != subintervals else left + width / 2
+
+    if method == "disc":
+        radii, heights = right_values, np.full(count, width)
+    elif method == "shell":
+        radii, heights = right, right_values
+    elif method == "frustum":
+        radii, heights = left_values, np.full(count, width)
+    else:
+        raise ValueError(f"unknown slice method {method!r}")
+
+    if count != subintervals:
+        # the cut off slice is only as thick as what's left of [a, b], and
+        # the ones past b are nothing at all
+        empty = right == left
+        radii = np.where(empty, 0.0, radii)
+        heights = np.where(empty, 0.0, heights) if method == "shell" else right - left
+
+    return RiemannSlices(left, right, centers, width, left_values, right_values, radii, heights)
+
+# n, n * factor, n * factor^2, ... up to stop. every grid's edges are also
+# edges of the next one, so with a RefinementCache each step only evaluates
+# the new points
+def nested_refinement(start, stop, factor=2):
+    sequence = []
+    subintervals = start
+    while subintervals < stop:
+        sequence.append(subintervals)
+        subintervals *= factor
+    return sequence
+
+# remembers f on the grids of recent refinement steps, keyed by
+# (function, a, b, n). edge k of an n grid is edge k * m / n of an m grid
+# whenever that's a whole number, so a new grid copies every value it shares
+# with a cached one and only evaluates the rest (every edge of the n = 6 grid
+# in the shell montage, half of each grid in a nested sequence). only the
+# max_grids most recently used grids are kept, and only grids asked for with
+# keep (a sweep reshaping a solid every frame only reads from the cache, or
+# it would push out the montage's grids)
+class RefinementCache:
+    def __init__(self, max_grids=8):
+        self.max_grids = max_grids
+        self.grids = OrderedDict()
+        # points actually passed to a function, for checking the reuse
+        self.evaluations = 0
+
+    def values(self, function, a, b, subintervals, keep=True):
+        key = (function, a, b, subintervals)
+        if key in self.grids:
+            self.grids.move_to_end(key)
+            return self.grids[key]
+
+        values = np.empty(subintervals + 1)
+        known = np.zeros(subintervals + 1, dtype=bool)
+        for (cached_function, cached_a, cached_b, cached_subintervals), cached_values in self.grids.items():
+            if (cached_function, cached_a, cached_b) != (function, a, b):
+                continue
+            shared = math.gcd(subintervals, cached_subintervals)
+            values[::subintervals // shared] = cached_values[::cached_subintervals // shared]
+            known[::subintervals // shared] = True
+
+        missing = ~known
+        values[missing] = evaluate(function, np.linspace(a, b, subintervals + 1)[missing])
+        self.evaluations += int(missing.sum())
+
+        values.flags.writeable = False
+        if keep:
+            self.grids[key] = values
+            while len(self.grids) > self.max_grids:
+                self.grids.popitem(last=False)
+        return values
+
+    # grids of a sweep (fractional subintervals, a count, or keep=False for
+    # the frames of a sweep of a or b) aren't kept
+    def slices(self, function, a, b, subintervals, method="disc", count=None, keep=True):
+        if count is not None and count != subintervals or subintervals != int(subintervals):
+            return riemann_slices(function, a, b, subintervals, method, count=count)
+        values = self.values(function, a, b, int(subintervals), keep)
+        return riemann_slices(function, a, b, int(subintervals), method, values)
+
+    def clear(self):
+        self.grids.clear()
+
+# shared by the scenes
+refinement_cache = RefinementCache()
@@ -0,0 +1,367 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import inspect
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from manim import *
+from manim.utils.exceptions import EndSceneEarlyException
+import numpy as np
+
+from framepool import is_camera_only_wait, play_camera_wait
+from layers import flat_moving_layer, keep_static_layer
+from texcache import load_tex_manifest, precompile_tex, save_tex_manifest, start_recording, stop_recording
+
+# a scene whose construct() is split into named segments:
+#
+#     def construct(self):
+#         self.next_segment("title")
+#         ...
+#         self.next_segment("solid", weirdfunc)
+#         ...
+#
+# a segment runs until the next next_segment call (or the end of construct).
+# once a segment has been rendered its partial movies are copied to
+# media_dir/segments/<scene>/<key>, and the next render with the same key
+# only runs the segment to get the scene into the right state and reuses the
+# copies. the key hashes
+#   - the segment's lines of construct, and the rest of the scene's code
+#     (its other methods and the modules next to it)
+#   - whatever is passed to next_segment after the name (functions are
+#     sampled, mobjects hashed by their points and colors)
+#   - the scene at entry: camera orientation, zoom and center, camera
+#     rotation rates, and the points and colors of everything on screen
+#   - the render quality
+# so a segment that builds something off screen and only shows it in a later
+# segment should pass it to the later segment's next_segment call.
+#
+# SEGMENTS=name,name,... renders only those segments (see the command line
+# at the bottom). every other segment, and every cached one, runs "state
+# only": animations are skipped and nothing is rasterized, so the mobjects,
+# camera and fixed-in-frame overlays get to where the selected segments
+# start without drawing a frame, and the scene ends after the last selected
+# segment.
+#
+# every TeX string the scene needed last time is compiled in parallel before
+# construct starts (see texcache.py), and frames are drawn in layers (see
+# framepool.py and layers.py)
+class SegmentedScene(ThreeDScene):
+    def setup(self):
+        super().setup()
+        self.state_only = False
+        self.segment = None
+        self.segments = []
+        self.selected_segments = selected_segments()
+        precompile_tex(load_tex_manifest(type(self).__name__))
+        start_recording()
+        keep_static_layer(self)
+
+    def next_segment(self, name, *inputs):
+        self.end_segment()
+        if self.selected_segments and self.selected_segments <= {segment["name"] for segment in self.segments}:
+            raise EndSceneEarlyException()
+        source = self.segment_source(inspect.currentframe().f_back.f_lineno)
+        key = self.segment_key(name, source, inputs)
+        directory = self.segment_cache_dir() / key
+        file_writer = self.renderer.file_writer
+        self.segment = {
+            "name": name,
+            "key": key,
+            "directory": directory,
+            "start": len(file_writer.partial_movie_files),
+            # skipping already (-s, -n, a skipped section), nothing to cache
+            "skipped": self.renderer._original_skipping_status,
+            "cached": self.segment_caching_enabled() and (directory / "segment.json").exists(),
+            "state_only": False,
+        }
+        if self.segment["skipped"]:
+            return
+        if self.selected_segments and name not in self.selected_segments:
+            self.segment["state_only"] = True
+            logger.info(f"Segment {name}: not selected, running state only")
+        elif self.segment["cached"]:
+            self.segment["state_only"] = True
+            logger.info(f"Segment {name}: using cached render {key[:12]}")
+        if self.segment["state_only"]:
+            self.set_state_only(True)
+
+    def end_segment(self):
+        segment = self.segment
+        if segment is None:
+            return
+        self.segment = None
+        file_writer = self.renderer.file_writer
+        segment["end"] = len(file_writer.partial_movie_files)
+        self.segments.append(segment)
+        if not segment["state_only"]:
+            return
+        self.set_state_only(False)
+        if self.selected_segments and segment["name"] not in self.selected_segments:
+            return
+
+        # every play of the segment left a None behind, put the cached
+        # partial movies in their place
+        manifest = json.loads((segment["directory"] / "segment.json").read_text())
+        files = [str(segment["directory"] / file) for file in manifest["files"]]
+        plays = segment["end"] - segment["start"]
+        if len(files) != plays:
+            logger.warning(f"Segment {segment['name']}: cached render has {len(files)} plays, expected {plays}")
+            return
+        file_writer.partial_movie_files[segment["start"]:segment["end"]] = files
+        if plays and hasattr(file_writer, "sections"):
+            file_writer.sections[-1].partial_movie_files[-plays:] = files
+
+    def tear_down(self):
+        self.end_segment()
+        # partial movies may still be encoding in the background
+        join = getattr(self.renderer.file_writer, "join_all_encode_jobs", None)
+        if join is not None:
+            join()
+        self.store_segments()
+        save_tex_manifest(type(self).__name__, stop_recording())
+        super().tear_down()
+
+    # skipped animations still draw the scene once or twice per play, so
+    # update_frame is switched off as well
+    def set_state_only(self, state_only):
+        self.state_only = state_only
+        self.renderer._original_skipping_status = state_only
+        self.renderer.skip_animations = state_only
+        if state_only:
+            self.renderer.update_frame = lambda *args, **kwargs: None
+        else:
+            del self.renderer.update_frame
+
+    # a skipped play jumps straight to its run time, while a rendered one
+    # steps through the frame times and stops a frame short of it, so an
+    # updater (ambient camera rotation) would end up somewhere else. state
+    # only plays step through the same times whenever something has an
+    # updater, so fast-forwarded and cached segments start exactly where a
+    # full render would
+    def get_time_progression(self, run_time, description, n_iterations = None, override_skip_animations = False):
+        override_skip_animations = override_skip_animations or (self.state_only and self.should_update_mobjects())
+        return super().get_time_progression(run_time, description, n_iterations, override_skip_animations)
+
+    # when only text and other flat mobjects change, the solids stay in the
+    # static image (see layers.py)
+    def get_moving_mobjects(self, *animations):
+        return flat_moving_layer(self, animations, super().get_moving_mobjects(*animations))
+
+    def play_internal(self, skip_rendering = False):
+        rendering = not (self.state_only or skip_rendering or self.renderer.skip_animations or self.skip_animation_preview)
+        # waits during an ambient camera rotation are drawn by several
+        # processes, over the turntable cache
+        if rendering and is_camera_only_wait(self) and play_camera_wait(self):
+            return
+        super().play_internal(skip_rendering)
+        if self.state_only:
+            self.update_mobjects(0)
+
+    def segment_caching_enabled(self):
+        return not config.disable_caching
+
+    def segment_cache_dir(self):
+        return Path(config.media_dir) / "segments" / type(self).__name__
+
+    # copy the partial movies of every freshly rendered segment into the cache
+    def store_segments(self):
+        if not self.segment_caching_enabled():
+            return
+        partial_movie_files = self.renderer.file_writer.partial_movie_files
+        for segment in self.segments:
+            if segment["state_only"] or segment["skipped"]:
+                continue
+            files = partial_movie_files[segment["start"]:segment["end"]]
+            if not all(file is not None and os.path.exists(file) for file in files):
+                continue
+            directory = segment["directory"]
+            directory.mkdir(parents=True, exist_ok=True)
+            names = []
+            for i, file in enumerate(files):
+                names.append(f"{i:04}{Path(file).suffix}")
+                shutil.copyfile(file, directory / names[-1])
+            manifest = {"name": segment["name"], "files": names}
+            (directory / "segment.json").write_text(json.dumps(manifest, indent=4))
+
+    # the lines of construct from the next_segment call at lineno up to the
+    # next one
+    def segment_source(self, lineno):
+        lines, first = inspect.getsourcelines(type(self).construct)
+        markers = [first + i for i, line in enumerate(lines) if "self.next_segment(" in line]
+        start = max([marker for marker in markers if marker <= lineno], default=first)
+        end = min([marker for marker in markers if marker > start], default=first + len(lines))
+        return "".join(lines[start - first:end - first])
+
+    def segment_key(self, name, source, inputs):
+        digest = hashlib.sha256()
+        for part in (name, source, self.code_fingerprint()):
+            digest.update(part.encode())
+        for value in inputs:
+            update_fingerprint(digest, value)
+        update_camera_fingerprint(digest, self.camera)
+        for mobject in self.mobjects:
+            update_fingerprint(digest, mobject)
+            digest.update(str(mobject in self.camera.fixed_in_frame_mobjects).encode())
+        digest.update(repr((
+            config.pixel_width, config.pixel_height, config.frame_rate,
+            str(config.background_color), config.format,
+        )).encode())
+        return digest.hexdigest()
+
+    # the scene's file without construct, and every module imported from the
+    # same directory
+    def code_fingerprint(self):
+        if not hasattr(self, "_code_fingerprint"):
+            scene_file = os.path.abspath(inspect.getsourcefile(type(self)))
+            directory = os.path.dirname(scene_file)
+            lines, first = inspect.getsourcelines(type(self).construct)
+            source = Path(scene_file).read_text().splitlines(keepends=True)
+            del source[first - 1:first - 1 + len(lines)]
+
+            digest = hashlib.sha256("".join(source).encode())
+            module_files = set()
+            for module in list(sys.modules.values()):
+                module_file = getattr(module, "__file__", None)
+                if module_file and module_file.endswith(".py"):
+                    module_files.add(os.path.abspath(module_file))
+            for module_file in sorted(module_files - {scene_file}):
+                if os.path.dirname(module_file) == directory:
+                    digest.update(Path(module_file).read_bytes())
+            self._code_fingerprint = digest.hexdigest()
+        return self._code_fingerprint
+
+# functions are compared by their values on a fixed grid, since the profile
+# lambdas have no useful identity between runs
+_sample_points = np.linspace(0, 6, 61) + 0.0137
+
+def update_fingerprint(digest, value):
+    if isinstance(value, Mobject):
+        for member in value.get_family():
+            digest.update(type(member).__name__.encode())
+            digest.update(np.ascontiguousarray(member.points, dtype=float).tobytes())
+            for name in ("fill_rgbas", "stroke_rgbas", "background_stroke_rgbas"):
+                if hasattr(member, name):
+                    digest.update(np.ascontiguousarray(getattr(member, name), dtype=float).tobytes())
+            digest.update(repr((getattr(member, "stroke_width", None), member.z_index)).encode())
+    elif isinstance(value, np.ndarray):
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            update_fingerprint(digest, item)
+    elif callable(value):
+        try:
+            with np.errstate(all="ignore"):
+                samples = np.array([value(x) for x in _sample_points], dtype=float)
+            digest.update(samples.tobytes())
+        except Exception:
+            digest.update(getattr(value, "__qualname__", repr(type(value))).encode())
+    else:
+        digest.update(repr(value).encode())
+
+def update_camera_fingerprint(digest, camera):
+    digest.update(repr((
+        camera.get_phi(), camera.get_theta(), camera.get_gamma(),
+        camera.get_zoom(), camera.get_focal_distance(),
+    )).encode())
+    digest.update(np.asarray(camera.frame_center, dtype=float).tobytes())
+    # ambient rotation is an updater on a tracker, whose closure holds the rate
+    for tracker in camera.get_value_trackers():
+        for updater in tracker.get_updaters():
+            for cell in updater.__closure__ or ():
+                if isinstance(cell.cell_contents, (int, float)):
+                    digest.update(repr(cell.cell_contents).encode())
+
+# names in the SEGMENTS environment variable, empty for all of them
+def selected_segments():
+    return {name.strip() for name in os.environ.get("SEGMENTS", "").split(",") if name.strip()}
+
+# segment names in the order they appear in a scene file's construct
+def segment_names(scene_file, scene_name):
+    source = Path(scene_file).read_text()
+    scene = re.search(rf"^class {scene_name}\b.*?(?=^class |\Z)", source, re.M | re.S)
+    if scene is None:
+        raise ValueError(f"no scene {scene_name} in {scene_file}")
+    return re.findall(r"self\.next_segment\(\s*[\"']([^\"']+)[\"']", scene.group(0))
+
+def manim_command(file, scene, manim_args):
+    return [sys.executable, "-m", "manim", "render", *manim_args, file, scene]
+
+# the part of manim's command line that decides where the TeX cache is and
+# what gets compiled into it (config file, media directory, TeX template),
+# applied to config here the way the manim processes will apply it
+def apply_manim_args(manim_args):
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument("-c", "--config_file")
+    parser.add_argument("--media_dir")
+    parser.add_argument("--tex_template")
+    args, _ = parser.parse_known_args(manim_args)
+    if args.config_file:
+        config.digest_file(args.config_file)
+    if args.media_dir:
+        config.media_dir = args.media_dir
+    if args.tex_template:
+        config.tex_template_file = args.tex_template
+        config.tex_template = TexTemplate.from_file(args.tex_template)
+
+# renders each segment in its own manim process, jobs at a time. every
+# worker fast-forwards to its segment and leaves it in the segment cache
+# under the same key a serial render would use, then one last serial render
+# finds every segment cached and just concatenates their partial movies
+# (manim's concat demuxer copies the streams, nothing is re-encoded)
+def render_parallel(file, scene, names, manim_args, jobs):
+    apply_manim_args(manim_args)
+    precompile_tex(load_tex_manifest(scene))
+
+    def render_segment(name):
+        # separate output files so the workers don't overwrite each other's movie
+        command = manim_command(file, scene, [*manim_args, "-o", f"{scene}_{name}", "--progress_bar", "none"])
+        # the workers share the cores when they draw frames in parallel too
+        env = dict(os.environ, SEGMENTS=name, FRAME_JOBS=str(max(1, (os.cpu_count() or 1) // jobs)))
+        result = subprocess.run(command, env=env, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(result.stdout, result.stderr, sep="\n", file=sys.stderr)
+        return name, result.returncode
+
+    with ThreadPoolExecutor(jobs) as pool:
+        for name, returncode in pool.map(render_segment, names):
+            print(f"segment {name}: {'done' if returncode == 0 else 'failed'}")
+            if returncode != 0:
+                return returncode
+
+    return subprocess.run(manim_command(file, scene, manim_args), env=dict(os.environ, SEGMENTS="")).returncode
+
+# python segments.py surfacearea.py SurfaceArea slant_height -- -ql
+# renders SurfaceArea with only the slant_height segment drawn. anything
+# after -- goes to manim as is, --list prints the scene's segments and
+# --jobs N renders the whole scene N segments at a time
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render some segments of a SegmentedScene.")
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("segments", nargs="*", help="segments to render (default: all)")
+    parser.add_argument("--list", action="store_true", help="list the scene's segments and exit")
+    parser.add_argument("--jobs", type=int, help="render all segments in parallel, this many at a time")
+    argv = sys.argv[1:]
+    manim_args = argv[argv.index("--") + 1:] if "--" in argv else []
+    args = parser.parse_args(argv[:argv.index("--")] if "--" in argv else argv)
+
+    names = segment_names(args.file, args.scene)
+    if args.list:
+        print("\n".join(names))
+        sys.exit(0)
+    unknown = set(args.segments) - set(names)
+    if unknown:
+        parser.error(f"unknown segments {', '.join(sorted(unknown))} (have {', '.join(names)})")
+
+    if args.jobs:
+        if args.segments:
+            parser.error("--jobs renders the whole scene, leave out the segment names")
+        sys.exit(render_parallel(args.file, args.scene, names, manim_args, args.jobs))
+    env = dict(os.environ, SEGMENTS=",".join(args.segments))
+    sys.exit(subprocess.run(manim_command(args.file, args.scene, manim_args), env=env).returncode)
@@ -1,31 +1,41 @@
 from manim import *
 import math
 
-weirdfunc = lambda x: 1.5 * (2.5 / (x + 1) - 0.5)
-weirdfunc_inv = lambda y: 2.5 / (y / 1.5 + 0.5) - 1
+from axesmap import axes_map
+from profiles import PROFILES
+from revolution import SurfaceOfRevolution
+from riemann import refinement_cache
+from segments import SegmentedScene
+from slices import MorphSlices, RiemannRectangles, c2p_many, gen_annular_shells, gen_cylinders, pixel_size
+from sumlabels import show_sums, sum_label
+from volumes import refinement_steps, riemann_sums
+
+weirdfunc = PROFILES["shell"]
+weirdfunc_inv = weirdfunc.inverse
 
 PEDDIE_BLUE = RGBA.from_rgb([24, 52, 83])
 PEDDIE_BLUE_LIGHT = RGBA.from_rgb([24 * 2, 52 * 2, 83 * 2])
 PEDDIE_GOLD = RGBA.from_rgb([204, 152, 0])
 
-class Shell(ThreeDScene):
+class Shell(SegmentedScene):
     # x's and y's in terms of axes coordinates
     def gen_rectangle(self, axes, x1, y1, x2, y2, color):
-        point1 = axes.c2p(x1, y1)
-        point2 = axes.c2p(x2, y2)
+        point1, point2, center = axes_map(axes)([[x1, y1], [x2, y2], [(x1 + x2) / 2, (y1 + y2) / 2]])
         height = abs(point2[1] - point1[1])
         width = abs(point2[0] - point1[0])
         rect = Rectangle(height = height, width = width, color = color)
         rect.set_fill(color, 0.5)
-        rect.move_to(axes.c2p((x1 + x2) / 2, (y1 + y2) / 2))
+        rect.move_to(center)
         return rect
 
     def gen_y_axis_parallel_cylinder(self, axes, center_x, center_y, center_z, radius, height, color, show_ends):
-        face1 = axes.c2p(center_x, center_y - height / 2, center_z)
-        face2 = axes.c2p(center_x, center_y + height / 2, center_z)
+        face1, face2, point3, center = axes_map(axes)([
+            [center_x, center_y - height / 2, center_z],
+            [center_x, center_y + height / 2, center_z],
+            [center_x + radius, center_y, center_z],
+            [center_x, center_y, center_z],
+        ])
         real_height = abs(face2[1] - face1[1])
-        
-        point3 = axes.c2p(center_x + radius, center_y, center_z)
         real_radius = abs(point3[0] - face1[0])
 
         cylinder = Cylinder(
@@ -37,54 +47,97 @@ class Shell(ThreeDScene):
             stroke_width = 1,
             show_ends = show_ends
         )
-        cylinder.move_to(axes.c2p(center_x, center_y, center_z))
+        cylinder.move_to(center)
         return cylinder
     
+    # gen_y_axis_parallel_cylinder for a whole array of slices centered on the y-axis.
+    # into=a merged solid from here reshapes it in place
+    def gen_y_axis_parallel_cylinders(self, axes, centers_y, radii, heights, colors, show_ends, merged = False, into = None):
+        zeros = np.zeros_like(centers_y)
+        face1 = c2p_many(axes, np.column_stack([zeros, centers_y - heights / 2, zeros]))
+        face2 = c2p_many(axes, np.column_stack([zeros, centers_y + heights / 2, zeros]))
+        real_heights = np.abs(face2[:, 1] - face1[:, 1])
+
+        point3 = c2p_many(axes, np.column_stack([radii, centers_y, zeros]))
+        real_radii = np.abs(point3[:, 0] - face1[:, 0])
+
+        return gen_cylinders(
+            c2p_many(axes, np.column_stack([zeros, centers_y, zeros])),
+            real_radii, real_heights,
+            direction = Y_AXIS,
+            fill_color = colors,
+            stroke_color = colors,
+            stroke_width = 1,
+            show_ends = show_ends,
+            zoom = self.camera.get_zoom(),
+            merged = merged,
+            into = into
+        )
+    
     def gen_y_disc_riemann(self, function, a, b, subintervals, axes):
-        dy = (b - a) / subintervals
-        cylinders = []
-        for i in range(subintervals):
-            yi = a + i * dy
-            color = PEDDIE_BLUE if i % 2 == 0 else PEDDIE_GOLD
-            cylinder = self.gen_y_axis_parallel_cylinder(
-                axes, 0, yi + dy / 2, 0,
-                function(yi + dy), dy, color, True
-            )
+        slices = refinement_cache.slices(function, a, b, subintervals)
+        colors = [PEDDIE_BLUE if i % 2 == 0 else PEDDIE_GOLD for i in range(subintervals)]
+        cylinders = self.gen_y_axis_parallel_cylinders(
+            axes, slices.centers, slices.radii, slices.heights, colors, True
+        )
+        for cylinder in cylinders:
             cylinder.set_opacity(0.5)
-            cylinders.append(cylinder)
         return cylinders
 
-    def gen_y_shell_riemann(self, function, a, b, subintervals, axes, show_ends):
-        dx = (b - a) / subintervals
-        cylinders = []
-        for i in range(0, subintervals - 1):
-            xi = a + i * dx
-            color = PEDDIE_BLUE_LIGHT if i % 2 == 0 else PEDDIE_GOLD
-            value = function(xi + dx)
-            cylinder = self.gen_y_axis_parallel_cylinder(
-                axes, 0, value / 2, 0,
-                xi + dx, value, color, show_ends
-            )
-            cylinder.set_fill(color)
-            cylinder.set_opacity(1)
-            cylinders.append(cylinder)
-        return cylinders
+    # hollow shells standing on the x-z plane around the y-axis, from
+    # inner_radii to outer_radii, all as one SliceMesh (shell i is mesh[i]).
+    # into=a solid from here reshapes it in place
+    def gen_y_axis_parallel_shells(self, axes, inner_radii, outer_radii, heights, colors, show_ends, into = None):
+        heights = np.asarray(heights, dtype=float)
+        zeros = np.zeros_like(heights)
+        face1 = c2p_many(axes, np.column_stack([zeros, zeros, zeros]))
+        face2 = c2p_many(axes, np.column_stack([zeros, heights, zeros]))
+        real_heights = np.abs(face2[:, 1] - face1[:, 1])
+
+        inner_point = c2p_many(axes, np.column_stack([inner_radii, zeros, zeros]))
+        outer_point = c2p_many(axes, np.column_stack([outer_radii, zeros, zeros]))
+        real_inner_radii = np.abs(inner_point[:, 0] - face1[:, 0])
+        real_outer_radii = np.abs(outer_point[:, 0] - face1[:, 0])
+
+        return gen_annular_shells(
+            c2p_many(axes, np.column_stack([zeros, heights / 2, zeros])),
+            real_inner_radii, real_outer_radii, real_heights,
+            direction = Y_AXIS,
+            fill_color = colors,
+            stroke_color = colors,
+            stroke_width = 1,
+            show_ends = show_ends,
+            zoom = self.camera.get_zoom(),
+            into = into
+        )
+
+    # shell i runs from x_i to x_{i+1} and is f(x_{i+1}) tall. merged=True
+    # returns the SliceMesh of every shell, otherwise a list with each shell's
+    # piece of it. subintervals can be fractional with count slices, and into
+    # reshapes a merged solid from here in place (see Disc.gen_x_cylinder_riemann)
+    def gen_y_shell_riemann(self, function, a, b, subintervals, axes, show_ends, merged = False, count = None, into = None):
+        slices = refinement_cache.slices(function, a, b, subintervals, method="shell", count = count, keep = into is None)
+        colors = [PEDDIE_BLUE_LIGHT if i % 2 == 0 else PEDDIE_GOLD for i in range(len(slices.radii) - 1)]
+        shells = self.gen_y_axis_parallel_shells(
+            axes, slices.left[:-1], slices.radii[:-1], slices.heights[:-1], colors, show_ends, into
+        )
+        if merged or into is not None:
+            return shells
+        return list(shells)
 
+    # every rectangle in one mobject, rects.rectangle(i) for just one
     def gen_riemann(self, function, a, b, subintervals, axes):
-        dx = (b - a) / subintervals
-        rects = []
-        for i in range(subintervals):
-            xi = a + i * dx
-            rect = self.gen_rectangle(axes, xi, 0, xi + dx, function(xi + dx), BLUE_E)
-            rects.append(rect)
-        return rects
+        slices = refinement_cache.slices(function, a, b, subintervals)
+        return RiemannRectangles(axes, slices.left, slices.right, slices.right_values, BLUE_E)
 
     def construct(self):
+        self.next_segment("title")
         disc_method_text = Tex("Cylindrical Shells").scale(2)
         self.play(Write(disc_method_text))
         self.wait(1)
         self.play(Unwrite(disc_method_text))
 
+        self.next_segment("disc_method", weirdfunc, weirdfunc_inv)
         axes = ThreeDAxes(
             x_range = [-5, 5],
             y_range = [-1, 4],
@@ -100,6 +153,7 @@ class Shell(ThreeDScene):
         function_plot = axes.plot(
             weirdfunc,
             x_range = [0, 4],
+            use_vectorized = True,
             color = BLUE
         )
 
@@ -108,7 +162,6 @@ class Shell(ThreeDScene):
 
         self.set_camera_orientation(zoom=0.8)
 
-        # COMMENT TO SKIP EXPLANATION OF WHY DISC DOESN'T WORK
         self.play(
             FadeIn(axes),
             FadeIn(x_label),
@@ -120,12 +173,9 @@ class Shell(ThreeDScene):
         
         self.wait(2)
         
-        surface = Surface(
-            lambda u, v: axes.c2p(
-                v * np.cos(u),
-                weirdfunc(v),
-                v * np.sin(u)
-            ),
+        surface = SurfaceOfRevolution(
+            axes, weirdfunc,
+            axis = Y_AXIS,
             u_range = [0, 2 * PI],
             v_range = [0, 4],
             checkerboard_colors = [PEDDIE_BLUE, PEDDIE_GOLD]
@@ -157,6 +207,7 @@ class Shell(ThreeDScene):
         function_plot = axes.plot(
             weirdfunc,
             x_range = [0, 4],
+            use_vectorized = True,
             color = BLUE
         )
         self.play(
@@ -182,6 +233,7 @@ class Shell(ThreeDScene):
         
         self.wait(2)
 
+        self.next_segment("disc_method_inverse")
         temp_cylinder = self.gen_y_axis_parallel_cylinder(axes, 0, 3 / 9, 2.5 / 2, 2.5 / 2, 3 / 9, WHITE, True)
         radius_brace = Brace(temp_cylinder, UP, color=YELLOW_B)
         radius_brace.rotate(90 * DEGREES, Y_AXIS, axes.c2p(0, 3 / 9, 2.5 / 2))
@@ -273,34 +325,19 @@ class Shell(ThreeDScene):
             Unwrite(label_new_new)
         )
         self.play(FadeOut(individual_cylinder))
-        # END COMMENT
-
-        surface = Surface(
-            lambda u, v: axes.c2p(
-                v * np.cos(u),
-                weirdfunc(v),
-                v * np.sin(u)
-            ),
+
+        self.next_segment("shells", weirdfunc)
+        surface = SurfaceOfRevolution(
+            axes, weirdfunc,
+            axis = Y_AXIS,
             u_range = [0, 2 * PI],
             v_range = [0, 4],
             checkerboard_colors = [PEDDIE_BLUE, PEDDIE_GOLD]
         )
         surface.set_opacity(0.75)
-
-        # IF COMMENT ABOVE UNCOMMENT BELOW
-        # self.play(
-        #     FadeIn(axes),
-        #     FadeIn(x_label),
-        #     FadeIn(y_label),
-        #     FadeIn(z_label),
-        #     Write(function_plot)
-        # )
-        # self.move_camera(phi=60 * DEGREES, theta=45 * DEGREES, gamma=115 * DEGREES, zoom=0.7, frame_center=axes.c2p(0, 1.5, 0), run_time=1.5)
-        # END UNCOMMENT
         
         self.wait(1)
 
-        # COMMENT TO REMOVE TEXT
         self.play(ChangeSpeed(Create(surface), speedinfo={0: 0.75}))
         shell_text = Tex(r"We can use \underline{cylindrical shells} instead.")
         shell_text.to_edge(UP)
@@ -312,14 +349,10 @@ class Shell(ThreeDScene):
         shell_text_new.move_to(shell_text)
         self.play(Transform(shell_text, shell_text_new))
         self.wait(4)
-        # END COMMENT
     
-        surface_more_transparent = Surface(
-            lambda u, v: axes.c2p(
-                v * np.cos(u),
-                weirdfunc(v),
-                v * np.sin(u)
-            ),
+        surface_more_transparent = SurfaceOfRevolution(
+            axes, weirdfunc,
+            axis = Y_AXIS,
             u_range = [PI / 2, 2 * PI],
             v_range = [0, 4],
             fill_color = WHITE
@@ -329,21 +362,14 @@ class Shell(ThreeDScene):
 
         cylinders = self.gen_y_shell_riemann(weirdfunc, 0, 4, 6, axes, True)
         for cylinder in cylinders:
-            # COMMENT FOR FASTER RENDERING
             self.play(Create(cylinder))
             self.wait(0.4)
-            # END COMMENT
-
-            # IF COMMENTING ABOVE UNCOMMENT
-            # self.add(cylinder)
-            # END UNCOMMENT
         
-        # COMMENT TO REMOVE TEXT
         self.wait(2)
         self.play(Unwrite(shell_text))
         self.wait(2)
-        # END COMMENT
 
+        self.next_segment("shell_refinement", weirdfunc, show_sums())
         shell_text2 = Tex(r"As the number of shells $\to\infty$...")
         shell_text2.to_edge(UP)
         self.add_fixed_in_frame_mobjects(shell_text2)
@@ -353,27 +379,25 @@ class Shell(ThreeDScene):
 
         cylinders_group = Group(*cylinders)
 
-        # COMMENT TO SKIP RIEMANN
-        for i in range(12, 37, 6):
-            cylinders_new = self.gen_y_shell_riemann(weirdfunc, 0, 4, i, axes, True)
-            cylinders_new_group = Group(*cylinders_new)
-            self.play(Transform(cylinders_group, cylinders_new_group))
+        refinement = refinement_steps(weirdfunc, 0, 4, "shell", 6, range(12, 37, 6), pixel_size(axes, self.camera.get_zoom()))
+        if show_sums():
+            # every sum in the montage, worked out at once
+            volumes = dict(zip([6, *refinement], riemann_sums(weirdfunc, 0, 4, [6, *refinement], "shell")))
+            volume_label = sum_label(volumes[6], shell_text2, DOWN)
+            self.add_fixed_in_frame_mobjects(volume_label)
+            self.play(FadeIn(volume_label))
+        for i in refinement:
+            cylinders_new = self.gen_y_shell_riemann(weirdfunc, 0, 4, i, axes, True, merged = True)
+            sum_labels = [Transform(volume_label, sum_label(volumes[i], shell_text2, DOWN))] if show_sums() else []
+            self.play(MorphSlices(cylinders_group, cylinders_new), *sum_labels)
+            cylinders_group = cylinders_new
             self.wait(0.2)
-        # END COMMENT
-    
-        # IF COMMENTING ABOVE UNCOMMENT
-        # cylinders_new = self.gen_y_shell_riemann(weirdfunc, 0, 4, 8, axes, True)
-        # cylinders_new_group = Group(*cylinders_new)
-        # self.play(Transform(cylinders_group, cylinders_new_group))
-        # self.wait(1)
-        # END UNCOMMENT
-
-        # COMMENT TO REMOVE TEXT
+
         shell_text3 = Tex(r"then volume of solid $\to\sum \text{volume of each cylindrical shell}$")
         shell_text3.scale(0.8)
         shell_text3.to_edge(UP)
         self.add_fixed_in_frame_mobjects(shell_text3)
-        self.play(FadeOut(shell_text2), FadeIn(shell_text3))
+        self.play(FadeOut(shell_text2), FadeIn(shell_text3), *([FadeOut(volume_label)] if show_sums() else []))
         self.wait(4)
 
         shell_text4 = MathTex(r"V=\lim_{n\to\infty}\sum_{i=1}^{n}", r"\text{volume of shell }i")
@@ -384,50 +408,34 @@ class Shell(ThreeDScene):
         self.play(FadeOut(shell_text3), FadeIn(shell_text4))
             
         self.wait(6)
-        # END COMMENT
         
+        self.next_segment("individual_shell", weirdfunc)
         self.wait(1)
 
-        cylinders_new = self.gen_y_shell_riemann(weirdfunc, 0, 4, 6, axes, True)
-        cylinders_new_group = Group(*cylinders_new)
-        self.play(Transform(cylinders_group, cylinders_new_group), Unwrite(shell_text4))
+        cylinders_new = self.gen_y_shell_riemann(weirdfunc, 0, 4, 6, axes, True, merged = True)
+        self.play(MorphSlices(cylinders_group, cylinders_new), Unwrite(shell_text4))
+        cylinders_group = cylinders_new
         
         self.wait(2)
 
         dx = 4 / 6
         individual_cylinder_max_y = weirdfunc(dx * 3)
-        individual_cylinder_outside = self.gen_y_axis_parallel_cylinder(
-            axes, 0, individual_cylinder_max_y / 2, 0,
-            dx * 3, individual_cylinder_max_y, PEDDIE_BLUE_LIGHT, False
-        )
-        individual_cylinder_outside.set_fill(PEDDIE_BLUE_LIGHT)
-        individual_cylinder_outside.set_opacity(1)
-
-        individual_cylinder_inside = self.gen_y_axis_parallel_cylinder(
-            axes, 0, individual_cylinder_max_y / 2, 0,
-            dx * 2, individual_cylinder_max_y, PEDDIE_BLUE_LIGHT, False
-        )
-        individual_cylinder_inside.set_fill(PEDDIE_BLUE_LIGHT)
-        individual_cylinder_inside.set_opacity(0.8)
-
-        individual_cylinder_top = Surface(
-            lambda u, v: axes.c2p(
-                v * np.cos(u),
-                individual_cylinder_max_y,
-                v * np.sin(u)
-            ),
-            u_range = [0, 2 * PI],
-            v_range = [dx * 2, dx * 3],
-            fill_color = PEDDIE_BLUE_LIGHT
+        individual_shell = self.gen_y_axis_parallel_shells(
+            axes, [dx * 2], [dx * 3], [individual_cylinder_max_y], PEDDIE_BLUE_LIGHT, "top"
         )
-        individual_cylinder_top.set_opacity(0.8)
-
-        self.add(individual_cylinder_outside, individual_cylinder_inside, individual_cylinder_top)
+        # the outside opaque, the inside and the top see-through
+        individual_shell.set_opacity(0.8)
+        fill_rgbas, stroke_rgbas, _ = individual_shell.get_face_styles()
+        fill_rgbas[:, individual_shell.parts["outside"], 3] = 1
+        stroke_rgbas[:, individual_shell.parts["outside"], 3] = 1
+        individual_shell.set_face_styles(fill_rgbas, stroke_rgbas)
+
+        self.add(individual_shell)
         self.play(FadeOut(cylinders_group))
         
         self.wait(2)
 
-        height_brace = Brace(individual_cylinder_outside, [1, 0, 0], color=LIGHT_PINK)
+        height_brace = Brace(individual_shell, [1, 0, 0], color=LIGHT_PINK)
         height_brace.rotate(45 * DEGREES, Y_AXIS, axes.c2p(0, 0, 0))
         height_text = MathTex(r"\text{Height}=f(x_i)", color=LIGHT_PINK)
         height_text.next_to(height_brace, np.array([1, 0, 1]))
@@ -445,6 +453,7 @@ class Shell(ThreeDScene):
         self.move_camera(phi=-90 * DEGREES, theta=90 * DEGREES, gamma=180 * DEGREES, zoom=0.7, frame_center=axes.c2p(0, dx / 2, 0), run_time=1.5)
         self.wait(1)
 
+        self.next_segment("cross_section")
         inside_label = MathTex("x_i", color=TEAL)
         inside_label.move_to(axes.c2p(dx * 2, 0, -2.5))
         inside_label.rotate(90 * DEGREES, X_AXIS)
@@ -547,9 +556,7 @@ class Shell(ThreeDScene):
         cross_section_area_text = cross_section_area_text_new
         self.wait(4)
 
-        individual_cylinder_outside.set_opacity(0.1)
-        individual_cylinder_inside.set_opacity(0.1)
-        individual_cylinder_top.set_opacity(0.1)
+        individual_shell.set_opacity(0.1)
         inside_brace.set_opacity(0.1)
         inside_brace_text.set_opacity(0.1)
         inside_arrow.set_opacity(0.1)
@@ -611,9 +618,7 @@ class Shell(ThreeDScene):
         self.wait(2)
         
         self.play(
-            FadeOut(individual_cylinder_outside),
-            FadeOut(individual_cylinder_inside),
-            FadeOut(individual_cylinder_top),
+            FadeOut(individual_shell),
             FadeOut(axes),
             FadeOut(z_label),
             FadeOut(inside_brace),
@@ -636,6 +641,7 @@ class Shell(ThreeDScene):
         self.play(MoveToTarget(cross_section_area_text_new))
         self.wait(4)
         
+        self.next_segment("shell_volume")
         formula_text2 = MathTex(
             r"V=\lim_{n\to\infty}\sum_{i=1}^{n}", r"\text{Volume of shell}", r"=", r"\lim_{n\to\infty}\sum_{i=1}^{n}\pi \left( (", r"x_{i+1}", r")^2-(", "x_i", r")^2 \right)", r"f(x_i)"
         )
@@ -0,0 +1,552 @@
+from manim import *
+import numpy as np
+
+from axesmap import axes_map
+from revolution import angle_table, corners_to_points, grid_to_face_points
+
+# axes.c2p on an (n, 3) array of axes coordinates, always returning (n, 3),
+# as one matrix multiply
+def c2p_many(axes, coords):
+    return axes_map(axes)(np.asarray(coords, dtype=float).reshape(-1, 3))
+
+# one color (or anything else) per slice
+def per_slice(value, subintervals):
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value] * subintervals
+
+# level of detail: how many faces it takes to cover each length (in scene
+# units) with faces about pixels_per_face pixels long, at the current render
+# quality and camera zoom. rounded up to a power of two so stacks built at
+# nearby sizes share a template
+def lod_segments(lengths, zoom = 1, pixels_per_face = 6, min_segments = 1, max_segments = 32):
+    pixels = np.abs(np.asarray(lengths, dtype=float)) * zoom * config.pixel_width / config.frame_width
+    segments = np.maximum(np.ceil(pixels / pixels_per_face), 1)
+    segments = 2 ** np.ceil(np.log2(segments))
+    return np.clip(segments, min_segments, max_segments).astype(int)
+
+# how much of axes' y units one pixel covers at camera zoom, for a frame
+# pixel_width pixels wide. this is 1920 and not the current render quality's,
+# so a montage cut off where it stops changing on screen
+# (volumes.refinement_steps) is the same animation in a -ql preview and in
+# the final render
+def pixel_size(axes, zoom = 1, pixel_width = 1920):
+    return config.frame_width / (pixel_width * zoom * axes.y_axis.get_unit_size())
+
+# (along, around) resolution for a whole stack of slices, which all share one
+# resolution so they can share one template / SliceMesh. the walls of
+# cylinders, shells and frustums are straight, so one row of faces along them
+# is exact and along is always 1. around is picked for the biggest slice, then
+# face_budget caps the faces in the whole stack: every slice has rings rings
+# of around faces (a cylinder's wall, a shell's two walls and its ends) plus
+# fixed_faces (a cylinder's flat ends), and around goes down, below
+# min_around if it has to, until they fit. it never goes below 3, so only a
+# stack of more than face_budget / (3 * rings) slices is over budget
+def lod_resolution(
+    radii,
+    zoom = 1,
+    pixels_per_face = 6,
+    min_around = 8,
+    max_around = 24,
+    face_budget = 4096,
+    rings = 1,
+    fixed_faces = 0
+):
+    radii = np.atleast_1d(radii)
+    around = lod_segments(2 * PI * np.max(np.abs(radii)), zoom, pixels_per_face, min_around, max_around)
+    if face_budget is not None:
+        affordable = (face_budget // len(radii) - fixed_faces) // rings
+        around = max(min(around, affordable), 3)
+    return 1, int(around)
+
+# unit cylinders (radius 1, height 1) centered at the origin, tessellated once
+# per direction / resolution / style, every slice is an array transform of
+# its points (see instance_cylinder_points)
+_cylinder_templates = {}
+
+def cylinder_template(direction = Z_AXIS, show_ends = True, resolution = (24, 24), **kwargs):
+    key = (
+        tuple(np.asarray(direction, dtype=float)), show_ends, str(resolution),
+        tuple(sorted((name, repr(value)) for name, value in kwargs.items())),
+    )
+    if key not in _cylinder_templates:
+        template = Cylinder(
+            radius = 1,
+            height = 1,
+            direction = direction,
+            show_ends = show_ends,
+            resolution = resolution,
+            **kwargs
+        )
+        members = template.family_members_with_points()
+        points = np.concatenate([member.points for member in members])
+        splits = np.cumsum([len(member.points) for member in members])[:-1]
+        _cylinder_templates[key] = (template, points, splits, template.get_center())
+    return _cylinder_templates[key]
+
+# fill rgba, stroke rgba and stroke width of every piece of a template, in
+# family_members_with_points order
+def template_styles(template):
+    members = template.family_members_with_points()
+    return (
+        np.array([member.fill_rgbas[0] for member in members]),
+        np.array([member.stroke_rgbas[0] for member in members]),
+        np.array([member.stroke_width for member in members], dtype=float),
+    )
+
+# a whole Riemann solid as one mobject. mesh[i] is a VGroup holding the faces
+# of slice i (so Transform lines slices up the same way as Group(*cylinders)),
+# and every slice has the same faces, so points and colors are kept as single
+# arrays: vertices is (slices, points per slice, 3), fill_rgbas and
+# stroke_rgbas are (slices, faces per slice, 4)
+class SliceMesh(VGroup):
+    def __init__(self, vertices, splits, fill_rgbas, stroke_rgbas, stroke_widths, shade_in_3d = True, **kwargs):
+        super().__init__(**kwargs)
+        self.splits = np.asarray(splits)
+        self.faces = []
+        for slice_index in range(len(vertices)):
+            piece = VGroup()
+            for face_index in range(len(self.splits) + 1):
+                face = ThreeDVMobject(shade_in_3d = shade_in_3d)
+                piece.add(face)
+                self.faces.append(face)
+            self.add(piece)
+        self.set_vertices(vertices)
+        self.set_face_styles(fill_rgbas, stroke_rgbas, stroke_widths)
+
+    def get_vertices(self):
+        return np.array([np.concatenate([face.points for face in piece]) for piece in self.submobjects])
+
+    def set_vertices(self, vertices):
+        vertices = np.asarray(vertices, dtype=float)
+        if len(vertices) != len(self.submobjects):
+            raise ValueError(f"expected vertices for {len(self.submobjects)} slices, got {len(vertices)}")
+        for piece, piece_points in zip(self.submobjects, vertices):
+            for face, face_points in zip(piece.submobjects, np.split(piece_points, self.splits)):
+                face.points = face_points
+        return self
+
+    def get_face_styles(self):
+        shape = (len(self.submobjects), len(self.splits) + 1)
+        return (
+            np.array([face.fill_rgbas[0] for face in self.faces]).reshape(*shape, 4),
+            np.array([face.stroke_rgbas[0] for face in self.faces]).reshape(*shape, 4),
+            np.array([face.stroke_width for face in self.faces], dtype=float).reshape(shape),
+        )
+
+    # any argument can be None to leave it alone
+    def set_face_styles(self, fill_rgbas = None, stroke_rgbas = None, stroke_widths = None):
+        shape = (len(self.submobjects), len(self.splits) + 1)
+        if fill_rgbas is not None:
+            fill_rgbas = np.broadcast_to(fill_rgbas, (*shape, 4)).reshape(-1, 4)
+            for face, rgba in zip(self.faces, fill_rgbas):
+                face.fill_rgbas = np.array([rgba])
+        if stroke_rgbas is not None:
+            stroke_rgbas = np.broadcast_to(stroke_rgbas, (*shape, 4)).reshape(-1, 4)
+            for face, rgba in zip(self.faces, stroke_rgbas):
+                face.stroke_rgbas = np.array([rgba])
+        if stroke_widths is not None:
+            stroke_widths = np.broadcast_to(stroke_widths, shape).reshape(-1)
+            for face, width in zip(self.faces, stroke_widths):
+                face.stroke_width = width
+        return self
+
+    # one fill color per slice, like calling set_fill on each cylinder
+    def set_fill_by_slice(self, colors, opacity = None):
+        fill_rgbas, _, _ = self.get_face_styles()
+        colors = per_slice(colors, len(self.submobjects))
+        fill_rgbas[..., :3] = np.array([color_to_rgba(color)[:3] for color in colors])[:, None, :]
+        if opacity is not None:
+            fill_rgbas[..., 3] = opacity
+        return self.set_face_styles(fill_rgbas = fill_rgbas)
+
+    def set_opacity(self, opacity, family = True):
+        fill_rgbas, stroke_rgbas, _ = self.get_face_styles()
+        fill_rgbas[..., 3] = opacity
+        stroke_rgbas[..., 3] = opacity
+        return self.set_face_styles(fill_rgbas, stroke_rgbas)
+
+# every cylinder's points in one array op: the unit template is stretched to
+# height along direction, to radius across it, then moved to its center.
+# centers, radii and heights are in scene units (already through axes.c2p).
+# only exact for axis-aligned directions, which is all the scenes use
+def instance_cylinder_points(unit_points, unit_center, direction, centers, radii, heights):
+    direction = normalize(np.asarray(direction, dtype=float))
+    radii = np.asarray(radii, dtype=float)[:, None, None]
+    heights = np.asarray(heights, dtype=float)[:, None, None]
+
+    def stretch(points):
+        along = (points @ direction)[..., None] * direction
+        return radii * points + (heights - radii) * along
+
+    points = stretch(unit_points[None])
+    shift = np.asarray(centers, dtype=float)[:, None, :] - stretch(unit_center[None, None])
+    return points + shift
+
+# Cylinder(radius=r, height=h, direction=direction, ...).move_to(center) for
+# every slice, without tessellating any of them. fill_color and stroke_color
+# can be a single color or one per slice. merged=True returns one SliceMesh,
+# otherwise a list of its slices (each a VGroup of faces looking like a
+# Cylinder, but none of them one). resolution=None picks it with
+# lod_resolution for a camera at zoom.
+#
+# into=a SliceMesh made by gen_cylinders(merged=True) reshapes that mesh in
+# place instead of building anything (same number of slices, styles left
+# alone) and returns it
+def gen_cylinders(
+    centers, radii, heights,
+    direction = Z_AXIS,
+    fill_color = BLUE_D,
+    stroke_color = LIGHT_GREY,
+    show_ends = True,
+    resolution = None,
+    zoom = 1,
+    merged = False,
+    into = None,
+    **kwargs
+):
+    if into is not None:
+        unit_points, unit_center, direction = into.unit_cylinder
+        return into.set_vertices(instance_cylinder_points(unit_points, unit_center, direction, centers, radii, heights))
+
+    subintervals = len(radii)
+    if resolution is None:
+        resolution = lod_resolution(radii, zoom, fixed_faces = 2 if show_ends else 0)
+    fill_colors = per_slice(fill_color, subintervals)
+    stroke_colors = per_slice(stroke_color, subintervals)
+
+    vertices = [None] * subintervals
+    fill_rgbas = [None] * subintervals
+    stroke_rgbas = [None] * subintervals
+    stroke_widths = [None] * subintervals
+    styles = {}
+    for i in range(subintervals):
+        styles.setdefault((repr(fill_colors[i]), repr(stroke_colors[i])), []).append(i)
+
+    for indices in styles.values():
+        template, unit_points, splits, unit_center = cylinder_template(
+            direction = direction,
+            show_ends = show_ends,
+            resolution = resolution,
+            fill_color = fill_colors[indices[0]],
+            stroke_color = stroke_colors[indices[0]],
+            **kwargs
+        )
+        all_points = instance_cylinder_points(
+            unit_points, unit_center, direction,
+            np.asarray(centers)[indices], np.asarray(radii)[indices], np.asarray(heights)[indices]
+        )
+        template_fill, template_stroke, template_widths = template_styles(template)
+        for i, points in zip(indices, all_points):
+            vertices[i] = points
+            fill_rgbas[i], stroke_rgbas[i], stroke_widths[i] = template_fill, template_stroke, template_widths
+
+    mesh = SliceMesh(vertices, splits, fill_rgbas, stroke_rgbas, stroke_widths)
+    # every style's template has the same points
+    mesh.unit_cylinder = (unit_points, unit_center, direction)
+    if merged:
+        return mesh
+    return list(mesh.submobjects)
+
+# hollow cylindrical shells: the outside wall at outer_radii, the inside wall
+# at inner_radii and, with show_ends, the flat rings closing them off at both
+# ends ("top" for only the end direction points to). centers, radii and
+# heights are in scene units, and only axis-aligned directions are exact.
+# fill_color and stroke_color can be a single color or one per shell. every
+# shell is built in one go as one SliceMesh, mesh[i] being shell i,
+# with each shell's faces in the order of mesh.parts ("outside", "inside",
+# "ends", slices of the faces of a shell). resolution is (along, around),
+# None picks it with lod_resolution for a camera at zoom. into=a SliceMesh
+# from here reshapes it in place like gen_cylinders does
+def gen_annular_shells(
+    centers, inner_radii, outer_radii, heights,
+    direction = Y_AXIS,
+    fill_color = BLUE_D,
+    stroke_color = LIGHT_GREY,
+    stroke_width = 0.5,
+    show_ends = True,
+    resolution = None,
+    zoom = 1,
+    into = None
+):
+    if into is not None:
+        return into.set_vertices(shell_vertices(centers, inner_radii, outer_radii, heights, *into.shell_layout))
+
+    if resolution is None:
+        rings = 2 + {True: 2, "top": 1, False: 0}[show_ends]
+        resolution = lod_resolution(outer_radii, zoom, face_budget = 2048, rings = rings)
+    vertices = shell_vertices(centers, inner_radii, outer_radii, heights, direction, show_ends, resolution)
+    subintervals = len(vertices)
+    along, around = resolution
+    walls = along * around
+    splits = np.arange(16, vertices.shape[1], 16)
+    fill_rgbas = np.array([color_to_rgba(color) for color in per_slice(fill_color, subintervals)])
+    stroke_rgbas = np.array([color_to_rgba(color) for color in per_slice(stroke_color, subintervals)])
+    mesh = SliceMesh(
+        vertices, splits,
+        fill_rgbas[:, None, :],
+        stroke_rgbas[:, None, :],
+        stroke_width
+    )
+    mesh.shell_layout = (direction, show_ends, resolution)
+    mesh.parts = {"outside": slice(0, walls), "inside": slice(walls, 2 * walls), "ends": slice(2 * walls, None)}
+    return mesh
+
+# the face points of every shell, (shells, points per shell, 3)
+def shell_vertices(centers, inner_radii, outer_radii, heights, direction, show_ends, resolution):
+    along, around = resolution
+    _, cos_u, sin_u = angle_table(0.0, float(2 * PI), around)
+    direction = normalize(np.asarray(direction, dtype=float))
+    across = normalize(np.cross(direction, Z_AXIS if abs(direction[2]) < 0.9 else X_AXIS))
+    ring = cos_u[:, None] * across + sin_u[:, None] * np.cross(direction, across)
+
+    # grid[k, j, i]: shell k, row j, angle i
+    centers = np.asarray(centers, dtype=float)[:, None, None, :]
+    heights = np.asarray(heights, dtype=float)[:, None, None, None]
+    inner_radii = np.asarray(inner_radii, dtype=float)[:, None, None, None]
+    outer_radii = np.asarray(outer_radii, dtype=float)[:, None, None, None]
+    rows = np.linspace(-0.5, 0.5, along + 1)[None, :, None, None]
+    grids = [
+        centers + rows * heights * direction + outer_radii * ring,
+        centers + rows * heights * direction + inner_radii * ring,
+    ]
+    ends = {True: [0.5, -0.5], "top": [0.5], False: []}[show_ends]
+    for side in ends:
+        radii = np.concatenate([inner_radii, outer_radii], axis=1)
+        grids.append(centers + side * heights * direction + radii * ring)
+    return np.concatenate([grid_to_face_points(grid).reshape(len(grid), -1, 3) for grid in grids], axis=1)
+
+# truncated cones about the x-axis from x1 (radius r1) to x2 (radius r2), all
+# in axes coordinates. a frustum is straight along its length, so each one is
+# a single ring of faces around the axis; resolution is the number of faces
+# around (None picks it with lod_resolution for a camera at zoom). all
+# frustums are built in one go and returned as one SliceMesh, mesh[i] being
+# frustum i. into=a SliceMesh from gen_frustums reshapes it in place like
+# gen_cylinders does
+def gen_frustums(
+    axes, x1, r1, x2, r2,
+    fill_color = BLUE_D,
+    stroke_color = LIGHT_GREY,
+    stroke_width = 0.5,
+    resolution = None,
+    zoom = 1,
+    into = None
+):
+    x1, r1, x2, r2 = (np.atleast_1d(np.asarray(value, dtype=float)) for value in (x1, r1, x2, r2))
+    if into is not None:
+        return into.set_vertices(frustum_vertices(axes, x1, r1, x2, r2, into.resolution))
+
+    subintervals = len(x1)
+    if resolution is None:
+        _, y_unit, _ = axes_map(axes).units
+        _, resolution = lod_resolution(
+            np.maximum(np.abs(r1), np.abs(r2)) * np.linalg.norm(y_unit),
+            zoom,
+            max_around = 32
+        )
+    vertices = frustum_vertices(axes, x1, r1, x2, r2, resolution)
+    splits = np.arange(16, vertices.shape[1], 16)
+    fill_rgbas = np.array([color_to_rgba(color) for color in per_slice(fill_color, subintervals)])
+    mesh = SliceMesh(
+        vertices, splits,
+        fill_rgbas[:, None, :],
+        color_to_rgba(stroke_color),
+        stroke_width
+    )
+    mesh.resolution = resolution
+    return mesh
+
+# the face points of every frustum, (frustums, points per frustum, 3)
+def frustum_vertices(axes, x1, r1, x2, r2, resolution):
+    _, cos_u, sin_u = angle_table(0.0, float(2 * PI), resolution)
+
+    # coords[k, j, i]: frustum k, end j, angle i
+    xs = np.stack([x1, x2], axis=1)[:, :, None]
+    radii = np.stack([r1, r2], axis=1)[:, :, None]
+    ring_cos, ring_sin = radii * cos_u, radii * sin_u
+    coords = np.stack([np.broadcast_to(xs, ring_cos.shape), ring_cos, ring_sin], axis=-1)
+    grid = axes_map(axes)(coords)
+    return grid_to_face_points(grid).reshape(len(x1), -1, 3)
+
+# an updater (mesh.add_updater(...)) that reshapes a mesh in place from
+# ValueTrackers, for sweeping a, b, a radius or a fractional n smoothly:
+# reshape(mesh, *values) gets the trackers' values and is expected to call
+# one of the builders with into=mesh. nothing happens on frames where no
+# value changed. for example, a disc solid whose right end follows b_tracker:
+#
+#     solid = self.gen_x_cylinder_riemann(f, 0, 5, 10, axes)
+#     solid.add_updater(tracker_updater(
+#         lambda solid, b: self.gen_x_cylinder_riemann(f, 0, b, 10, axes, into = solid), b_tracker
+#     ))
+def tracker_updater(reshape, *trackers):
+    last_values = [None]
+
+    def updater(mesh):
+        values = tuple(tracker.get_value() for tracker in trackers)
+        if values != last_values[0]:
+            last_values[0] = values
+            reshape(mesh, *values)
+
+    return updater
+
+# Riemann rectangles from left to right up to heights (all in axes
+# coordinates) as one VMobject, each rectangle a subpath of it, all in one
+# style: Rectangle(color = color).set_fill(color, fill_opacity) for each.
+# rects.rectangle(i) is rectangle i on its own, for BraceLabel and such
+class RiemannRectangles(VMobject):
+    def __init__(self, axes, left, right, heights, color = BLUE_E, fill_opacity = 0.5, **kwargs):
+        super().__init__(stroke_color = color, fill_color = color, fill_opacity = fill_opacity, **kwargs)
+        left, right, heights = (np.atleast_1d(np.asarray(value, dtype=float)) for value in (left, right, heights))
+        self.count = len(left)
+        bottom, top = np.minimum(heights, 0), np.maximum(heights, 0)
+        # the corners in Rectangle's order: UR, UL, DL, DR and back
+        corners = np.stack([
+            np.stack(corner, axis=-1)
+            for corner in ((right, top), (left, top), (left, bottom), (right, bottom), (right, top))
+        ], axis=1)
+        self.set_points(corners_to_points(axes_map(axes)(corners)).reshape(-1, 3))
+
+    def rectangle(self, i):
+        rect = VMobject()
+        rect.set_points(self.points[16 * i:16 * (i + 1)])
+        rect.match_style(self)
+        return rect
+
+    def rectangles(self):
+        return [self.rectangle(i) for i in range(self.count)]
+
+# a solid made of slices, slice i being group[i]: a SliceMesh, a
+# RiemannRectangles (each rectangle a slice), or a Group of Cylinders /
+# Rectangles / anything Transform has reshaped. a Surface (a
+# SurfaceOfRevolution) is one piece, its submobjects are faces
+def is_slice_group(mobject):
+    return isinstance(mobject, (Group, VGroup, RiemannRectangles)) and not isinstance(mobject, Surface)
+
+# the faces of every slice of a slice group
+def slice_faces(group):
+    if isinstance(group, RiemannRectangles):
+        return [[rect] for rect in group.rectangles()]
+    return [piece.family_members_with_points() for piece in group.submobjects]
+
+# which of count things each of total places gets, spreading the repeats out
+# the same way Transform pads the shorter of two submobject lists, and which
+# places got a repeat rather than the first of its thing
+def spread(count, total):
+    indices = (np.arange(total) * count) // total
+    repeats = np.concatenate([[False], indices[1:] == indices[:-1]])
+    return indices, repeats
+
+# pairs up the faces of two solids slice by slice: the solid with fewer
+# slices has each of its slices split into copies to cover the other's, and
+# the same for faces within a pair of slices. returns one list per slice of
+# (source face, target face, source is a copy, target is a copy). if either
+# isn't a slice group, the two are lined up face by face as one slice, the
+# way Transform would
+def align_slices(source, target):
+    if is_slice_group(source) and is_slice_group(target):
+        source_slices, target_slices = slice_faces(source), slice_faces(target)
+    else:
+        source_slices, target_slices = [source.family_members_with_points()], [target.family_members_with_points()]
+    slices = max(len(source_slices), len(target_slices))
+    pairs = []
+    for (i, source_copy), (j, target_copy) in zip(
+        zip(*spread(len(source_slices), slices)), zip(*spread(len(target_slices), slices))
+    ):
+        source_faces, target_faces = source_slices[i], target_slices[j]
+        faces = max(len(source_faces), len(target_faces))
+        pairs.append([
+            (source_faces[k], target_faces[l], source_copy or source_face_copy, target_copy or target_face_copy)
+            for (k, source_face_copy), (l, target_face_copy) in zip(
+                zip(*spread(len(source_faces), faces)), zip(*spread(len(target_faces), faces))
+            )
+        ])
+    return pairs
+
+# fill rgba, stroke rgba and stroke width of a face, see-through if it's a copy
+def face_style(face, copy):
+    fill_rgba, stroke_rgba = np.array(face.fill_rgbas[0], dtype=float), np.array(face.stroke_rgbas[0], dtype=float)
+    if copy:
+        fill_rgba[3] = stroke_rgba[3] = 0
+    return fill_rgba, stroke_rgba, face.stroke_width
+
+# Transform(mobject, target) for two Riemann solids (or two
+# RiemannRectangles) with different numbers of slices, without lining the
+# slices up again every frame. the faces are paired once when the animation
+# is made and every face's start and end points go into one array, so a
+# frame is one lerp over all the points (and over the colors if they
+# change). the copies a slice is split into fade in and out the way
+# Transform's do. the solid being drawn in between is a new mobject: mobject
+# is taken out of the scene when the animation starts and target is put in
+# when it ends, like ReplacementTransform
+class MorphSlices(Animation):
+    def __init__(self, mobject, target, **kwargs):
+        self.source = mobject
+        self.target = target
+
+        slices = align_slices(mobject, target)
+        start, end = [], []
+        start_styles, end_styles = [], []
+        for slice_pairs in slices:
+            for source_face, target_face, source_copy, target_copy in slice_pairs:
+                if len(source_face.points) != len(target_face.points):
+                    source_face, target_face = source_face.copy(), target_face.copy()
+                    source_face.align_points(target_face)
+                start.append(source_face.points)
+                end.append(target_face.points)
+                start_styles.append(face_style(source_face, source_copy))
+                end_styles.append(face_style(target_face, target_copy))
+
+        if isinstance(mobject, RiemannRectangles) and isinstance(target, RiemannRectangles):
+            # every rectangle stays a subpath of one VMobject, which fills
+            # overlapping copies once, so they needn't fade
+            morph = VMobject()
+            self.faces = [morph]
+            start, end = [np.concatenate(start)], [np.concatenate(end)]
+            start_styles, end_styles = [face_style(mobject, False)], [face_style(target, False)]
+        else:
+            morph = VGroup()
+            self.faces = []
+            for slice_pairs in slices:
+                piece = VGroup()
+                for source_face, _, _, _ in slice_pairs:
+                    face = VMobject(shade_in_3d = getattr(source_face, "shade_in_3d", False))
+                    piece.add(face)
+                    self.faces.append(face)
+                morph.add(piece)
+
+        self.splits = np.cumsum([len(points) for points in start])[:-1]
+        self.start = np.concatenate(start)
+        self.delta = np.concatenate(end) - self.start
+        self.start_styles = [np.array([style[k] for style in start_styles], dtype=float) for k in range(3)]
+        self.style_deltas = [np.array([style[k] for style in end_styles], dtype=float) - self.start_styles[k] for k in range(3)]
+        self.styles_change = any(np.any(delta) for delta in self.style_deltas)
+        self.set_styles(self.start_styles)
+        super().__init__(morph, **kwargs)
+
+    def set_styles(self, styles):
+        for face, fill_rgba, stroke_rgba, stroke_width in zip(self.faces, *styles):
+            face.fill_rgbas = np.array([fill_rgba])
+            face.stroke_rgbas = np.array([stroke_rgba])
+            face.stroke_width = stroke_width
+
+    # nothing to copy, the start is already in self.start
+    def begin(self):
+        self.interpolate(0)
+
+    def interpolate_mobject(self, alpha):
+        alpha = self.rate_func(alpha)
+        points = self.start + alpha * self.delta
+        for face, face_points in zip(self.faces, np.split(points, self.splits)):
+            face.points = face_points
+        if self.styles_change:
+            self.set_styles([start + alpha * delta for start, delta in zip(self.start_styles, self.style_deltas)])
+
+    def _setup_scene(self, scene):
+        super()._setup_scene(scene)
+        if scene is not None:
+            scene.remove(self.source)
+
+    def clean_up_from_scene(self, scene):
+        super().clean_up_from_scene(scene)
+        scene.remove(self.mobject)
+        scene.add(self.target)
@@ -0,0 +1,20 @@
+import os
+
+from manim import *
+
+# SHOW_SUMS=1 puts the value of the Riemann sum (from volumes.riemann_sums)
+# next to its formula through each refinement montage. off by default, the
+# videos don't show them
+def show_sums():
+    return os.environ.get("SHOW_SUMS", "") not in ("", "0")
+
+# "≈ value" next to formula, in its color. for a formula that is fixed in the
+# frame, add the first label with add_fixed_in_frame_mobjects and Transform
+# it into the later ones
+def sum_label(value, formula, direction = RIGHT, num_decimal_places = 4, scale = 0.8):
+    label = VGroup(MathTex(r"\approx"), DecimalNumber(value, num_decimal_places = num_decimal_places))
+    label.arrange(RIGHT, buff = 0.15)
+    label.scale(scale)
+    label.set_color(formula.get_color())
+    label.next_to(formula, direction)
+    return label
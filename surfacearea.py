@@ -1,62 +1,65 @@
 from manim import *
 import math
 
-weirdfunc = lambda x: (2 * math.log(2, math.e) * math.exp(math.sin(x))) / math.log(x + 2, math.e)
+from axesmap import axes_map
+from profiles import PROFILES
+from revolution import SurfaceOfRevolution
+from riemann import refinement_cache
+from segments import SegmentedScene
+from slices import MorphSlices, gen_frustums, pixel_size
+from sumlabels import show_sums, sum_label
+from volumes import refinement_steps, riemann_sums
+
+weirdfunc = PROFILES["surface_area"]
 
 PEDDIE_BLUE = RGBA.from_rgb([24, 52, 83])
 PEDDIE_GOLD = RGBA.from_rgb([204, 152, 0])
 
-class SurfaceArea(ThreeDScene):
+class SurfaceArea(SegmentedScene):
     # x's and y's in terms of axes coordinates
     def gen_rectangle(self, axes, x1, y1, x2, y2, color):
-        point1 = axes.c2p(x1, y1)
-        point2 = axes.c2p(x2, y2)
+        point1, point2, center = axes_map(axes)([[x1, y1], [x2, y2], [(x1 + x2) / 2, (y1 + y2) / 2]])
         height = abs(point2[1] - point1[1])
         width = abs(point2[0] - point1[0])
         rect = Rectangle(height = height, width = width, color = color)
         rect.set_fill(color, 0.5)
-        rect.move_to(axes.c2p((x1 + x2) / 2, (y1 + y2) / 2))
+        rect.move_to(center)
         return rect
 
     # must have x1 < x2
     def gen_x_axis_truncated_cone(self, axes, x1, y1, x2, y2, color):
-        slope = (y1 - y2) / (x1 - x2)
-        c = y1 - slope * x1
-        function = lambda x : slope * x + c
-        cone = Surface(
-            lambda u, v: axes.c2p(
-                v, function(v) * np.cos(u), function(v) * np.sin(u)
-            ),
-            u_range = [0, 2 * PI],
-            v_range = [x1, x2],
-            checkerboard_colors = [color]
-        )
-        return cone
+        return gen_frustums(axes, x1, y1, x2, y2, fill_color = color, zoom = self.camera.get_zoom())[0]
     
-    def gen_x_truncated_cone_riemann(self, function, a, b, subintervals, axes):
-        dx = (b - a) / subintervals
-        cones = []
-        for i in range(subintervals):
-            xi = a + i * dx
-            color = PEDDIE_BLUE if i % 2 == 0 else PEDDIE_GOLD
-            cone = self.gen_x_axis_truncated_cone(
-                axes,
-                x1 = xi,
-                y1 = function(xi),
-                x2 = xi + dx,
-                y2 = function(xi + dx),
-                color = color
-            )
-            cone.set_opacity(0.8)
-            cones.append(cone)
+    # subintervals can be fractional with count slices, and into reshapes a
+    # solid from here in place (see Disc.gen_x_cylinder_riemann)
+    def gen_x_truncated_cone_riemann(self, function, a, b, subintervals, axes, count = None, into = None):
+        slices = refinement_cache.slices(function, a, b, subintervals, method="frustum", count = count, keep = into is None)
+        colors = [PEDDIE_BLUE if i % 2 == 0 else PEDDIE_GOLD for i in range(len(slices.left))]
+        # the slices past b have zero radius, so this collapses them too
+        right_values = np.where(slices.right == slices.left, 0.0, slices.right_values)
+        cones = gen_frustums(
+            axes,
+            x1 = slices.left,
+            r1 = slices.radii,
+            x2 = slices.right,
+            r2 = right_values,
+            fill_color = colors,
+            zoom = self.camera.get_zoom(),
+            into = into
+        )
+        if into is not None:
+            return cones
+        cones.set_opacity(0.8)
         return cones
 
     def construct(self):
+        self.next_segment("title")
         text = Tex("Surface Area").scale(2)
         self.play(Write(text))
         self.wait(1)
         self.play(Unwrite(text))
 
+        self.next_segment("graph", weirdfunc)
         axes = ThreeDAxes(
             x_range = [0, 6],
             y_range = [-4, 4],
@@ -72,6 +75,7 @@ class SurfaceArea(ThreeDScene):
         function_plot = axes.plot(
             weirdfunc,
             x_range = [0, 5],
+            use_vectorized = True,
             color = BLUE
         )
         label = MathTex("y = f(x)", color=BLUE)
@@ -92,11 +96,9 @@ class SurfaceArea(ThreeDScene):
         self.move_camera(phi=75 * DEGREES, theta=-30 * DEGREES, zoom=0.8, run_time=1.5, frame_center=[0, 0, 0.8])
         self.begin_ambient_camera_rotation(rate=-0.1)
         
-        # comment to remove surface
-        surface = Surface(
-            lambda u, v: axes.c2p(
-                v, weirdfunc(v) * np.cos(u), weirdfunc(v) * np.sin(u)
-            ),
+        self.next_segment("surface", weirdfunc)
+        surface = SurfaceOfRevolution(
+            axes, weirdfunc,
             u_range = [0, 2 * PI],
             v_range = [0, 5],
             checkerboard_colors = [PEDDIE_BLUE, PEDDIE_GOLD]
@@ -143,15 +145,8 @@ class SurfaceArea(ThreeDScene):
             Unwrite(display_text),
             Unwrite(display_text_2),
         )
-        # end comment to remove surface
-        
-        # if removing surface, uncomment below
-        # cones = self.gen_x_truncated_cone_riemann(weirdfunc, 0, 5, 5, axes)
-        # surface = Group(cones[1])
-        # self.add(surface)
-        # end uncomment below
 
-        # comment to remove spinning around individual cone
+        self.next_segment("individual_cone")
         self.wait(1)
         self.begin_ambient_camera_rotation(rate=-0.25)
         self.move_camera(
@@ -160,7 +155,6 @@ class SurfaceArea(ThreeDScene):
             frame_center = axes.c2p(1.5, 0, 0),
         )
         self.wait(6)
-        # end comment
 
         self.move_camera(
             phi = 0 * DEGREES,
@@ -174,7 +168,7 @@ class SurfaceArea(ThreeDScene):
 
         self.wait(1)
         
-        # comment to skip slant height explanation
+        self.next_segment("slant_height", weirdfunc)
         slant_line_start = axes.c2p(1, weirdfunc(1), 0),
         slant_line_end = axes.c2p(2, weirdfunc(2), 0),
         slant_line = Line(start=slant_line_start, end=slant_line_end)
@@ -360,18 +354,9 @@ class SurfaceArea(ThreeDScene):
             FadeOut(slant_area_formula_equal),
         )
         self.wait(2)
-        # end comment to skip slant height explanation
-
-        # if commenting to skip slant height explanation, uncomment below
-        # slant_area_formula = MathTex(r"\pi", r"\sqrt{(\Delta x)^2 + \left(f(x_{i+1})-f(x_i)\right)^2}", "(", "f(x_i)", "+", "f(x_{i+1})", ")", tex_environment="gather*")
-        # slant_area_formula.set_color_by_tex("f(x_i)", BLUE_B)
-        # slant_area_formula.set_color_by_tex("f(x_{i+1})", TEAL_C)
-        # slant_area_formula.set_color_by_tex(r"\Delta", YELLOW_B)
-        # slant_area_formula.move_to(axes.c2p(3.5, -2 - 1.5, 0))
-        # slant_area_formula.scale(0.85)
-        # self.add(slant_area_formula)
-        # end uncomment
 
+        # cones was built in the surface segment and is mostly off screen
+        self.next_segment("surface_sum", weirdfunc, cones)
         cones[1].set_opacity(0.8)
         surface_new = Group(*cones)
         self.play(Transform(surface, surface_new))
@@ -492,16 +477,26 @@ class SurfaceArea(ThreeDScene):
         self.play(Transform(prompt_text, prompt_text_new))
         self.wait(2)
         
+        self.next_segment("surface_refinement", weirdfunc, show_sums())
+        refinement = refinement_steps(weirdfunc, 0, 5, "frustum", 5, range(6, 62, 5), pixel_size(axes, self.camera.get_zoom()))
+        if show_sums():
+            # every sum in the montage, worked out at once
+            areas = dict(zip([5, *refinement], riemann_sums(weirdfunc, 0, 5, [5, *refinement], "frustum")))
+            area_label = sum_label(areas[5], surface_area_approx, DOWN)
+            self.play(FadeIn(area_label))
         # surface is the old thing
         # for i in range(61, 62, 1):
-        for i in range(6, 62, 5):
+        for i in refinement:
             riemann_cones = self.gen_x_truncated_cone_riemann(weirdfunc, 0, 5, i, axes)
             surface_new = Group(*riemann_cones)
             cone_under_dx_label_new = BraceLabel(riemann_cones[round(i / 5 * 2)], r"\Delta x", brace_direction=DOWN)
+            sum_labels = [Transform(area_label, sum_label(areas[i], surface_area_approx, DOWN))] if show_sums() else []
             self.play(
-                Transform(surface, surface_new),
-                Transform(cone_under_dx_label, cone_under_dx_label_new)
+                MorphSlices(surface, surface_new),
+                Transform(cone_under_dx_label, cone_under_dx_label_new),
+                *sum_labels
             )
+            surface = surface_new
             self.wait(0.7)
             
         surface_area_approx_text_new = MathTex(
@@ -509,7 +504,7 @@ class SurfaceArea(ThreeDScene):
         )
         surface_area_approx_text_new.scale(0.7)
         surface_area_approx_text_new.move_to(surface_area_approx)
-        self.play(Transform(surface_area_approx, surface_area_approx_text_new))
+        self.play(Transform(surface_area_approx, surface_area_approx_text_new), *([FadeOut(area_label)] if show_sums() else []))
         self.wait(2)
 
         prompt_text_new = Tex(r"... then $\Delta x$ approaches $0$", font_size=36)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from axesmap import AxesMap
+
+# axes.c2p taking an (n, 3) array of coordinates, the way AxesMap calls it
+class LinearAxes:
+    origin = np.array([-3.0, -2.0, 0.5])
+    units = np.array([[0.8, 0.0, 0.0], [0.0, 0.55, 0.0], [0.1, 0.0, 0.6]])
+
+    def __init__(self):
+        self.calls = 0
+
+    def c2p(self, coords):
+        self.calls += 1
+        return self.origin + np.asarray(coords, dtype=float) @ self.units
+
+# x log scaled, like a NumberLine with a LogBase scaling
+class LogAxes(LinearAxes):
+    def c2p(self, coords):
+        coords = np.array(coords, dtype=float)
+        coords[:, 0] = np.log10(np.maximum(coords[:, 0], 1e-3))
+        return super().c2p(coords)
+
+coords = np.random.default_rng(0).uniform(0.5, 6, (4, 5, 3))
+
+def test_linear_axes_map_with_one_c2p_call():
+    axes = LinearAxes()
+    mapping = AxesMap(axes)
+    assert mapping.linear
+    np.testing.assert_allclose(mapping(coords), axes.c2p(coords.reshape(-1, 3)).reshape(coords.shape), atol = 1e-12)
+    np.testing.assert_allclose(mapping(coords[..., :2]), axes.c2p(np.concatenate(
+        [coords[..., :2], np.zeros((4, 5, 1))], axis = -1
+    ).reshape(-1, 3)).reshape(coords.shape), atol = 1e-12)
+    # the map called c2p once, to work itself out; the other two are the
+    # expected values above
+    assert axes.calls == 3
+
+def test_axes_failing_the_probe_fall_back_to_c2p():
+    axes = LogAxes()
+    mapping = AxesMap(axes)
+    assert not mapping.linear
+    np.testing.assert_allclose(mapping(coords), axes.c2p(coords.reshape(-1, 3)).reshape(coords.shape), atol = 1e-12)
+
+def test_matches_manim_axes():
+    manim = pytest.importorskip("manim")
+    axes = manim.ThreeDAxes(x_range = [0, 6], y_range = [-4, 4]).scale(0.8).shift(manim.LEFT)
+    points = AxesMap(axes)(coords.reshape(-1, 3))
+    np.testing.assert_allclose(points, [axes.c2p(*point) for point in coords.reshape(-1, 3)], atol = 1e-9)
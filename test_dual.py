@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+import dual
+from profiles import PROFILES
+
+x = np.linspace(0.1, 4, 200)
+
+@pytest.mark.parametrize("name", ["disc", "shell", "shell_inverse", "vase", "horn"])
+def test_dual_numbers_match_the_written_derivatives(name):
+    profile = PROFILES[name]
+    values, slopes = dual.value_and_derivative(profile.function, x)
+    np.testing.assert_allclose(values, profile.function(x), rtol = 1e-15)
+    np.testing.assert_allclose(slopes, profile.given_derivative(x), rtol = 1e-15, atol = 1e-15)
+
+def test_abs_and_zero_power():
+    values, slopes = dual.value_and_derivative(lambda x: abs(x - 1) + x ** 0, np.array([0.0, 2.0]))
+    np.testing.assert_array_equal(values, [2.0, 2.0])
+    np.testing.assert_array_equal(slopes, [-1.0, 1.0])
+    assert not np.isnan(dual.derivative(lambda x: x ** 0, 0.0))
@@ -0,0 +1,34 @@
+import math
+
+import numpy as np
+import pytest
+
+from answers import horn_profile, surface_area, volume
+from quadrature import integrate
+
+def test_horn_volume_is_pi():
+    result = volume(horn_profile(1), 1, math.inf)
+    assert result.converged and not result.diverges
+    assert result.value == pytest.approx(math.pi, rel = 1e-10)
+
+def test_horn_surface_area_diverges():
+    result = surface_area(horn_profile(1), 1, math.inf)
+    assert result.diverges
+    assert result.value == math.inf
+
+def test_finite_interval_within_its_error():
+    result = integrate(lambda x: x ** 0.5, 0, 4)
+    assert result.converged
+    assert abs(result.value - 16 / 3) <= max(result.error, 1e-12)
+
+# slowly decaying tails, whose segments keep adding more until they reach
+# the scale the integrand decays on
+@pytest.mark.parametrize("integrand, exact", [
+    (lambda x: x * np.exp(-x / 200), 40000),
+    (lambda x: np.exp(-x / 1e4), 1e4),
+    (lambda x: 1 / (1 + (x / 1000) ** 2), 500 * math.pi),
+])
+def test_slow_tails_converge(integrand, exact):
+    result = integrate(integrand, 0, math.inf)
+    assert result.converged and not result.diverges
+    assert result.value == pytest.approx(exact, rel = 1e-10)
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from riemann import RefinementCache, nested_refinement, riemann_slices
+
+f = lambda x: np.exp(np.sin(x)) + 1
+
+def test_disc_slices_sample_the_right_edges():
+    slices = riemann_slices(f, 1, 4, 6)
+    edges = np.linspace(1, 4, 7)
+    np.testing.assert_allclose(slices.left, edges[:-1])
+    np.testing.assert_allclose(slices.right, edges[1:])
+    np.testing.assert_allclose(slices.centers, (edges[:-1] + edges[1:]) / 2)
+    np.testing.assert_allclose(slices.radii, f(edges[1:]))
+    np.testing.assert_allclose(slices.heights, 0.5)
+
+def test_shell_and_frustum_slices():
+    edges = np.linspace(0, 2, 5)
+    shells = riemann_slices(f, 0, 2, 4, "shell")
+    np.testing.assert_allclose(shells.radii, edges[1:])
+    np.testing.assert_allclose(shells.heights, f(edges[1:]))
+    frustums = riemann_slices(f, 0, 2, 4, "frustum")
+    np.testing.assert_allclose(frustums.radii, f(edges[:-1]))
+    np.testing.assert_allclose(frustums.right_values, f(edges[1:]))
+
+def test_unknown_method_raises():
+    with pytest.raises(ValueError):
+        riemann_slices(f, 0, 1, 4, "washer")
+
+def test_nested_refinement_doubles_up_to_stop():
+    assert nested_refinement(3, 50) == [3, 6, 12, 24, 48]
+    assert nested_refinement(5, 100, 3) == [5, 15, 45]
+
+@pytest.mark.parametrize("method", ["disc", "shell", "frustum"])
+def test_cached_refinement_matches_fresh_slices(method):
+    cache = RefinementCache()
+    for n in [6, 12, 18, 24, 30, 36]:
+        cached = cache.slices(f, 0, 4, n, method)
+        fresh = riemann_slices(f, 0, 4, n, method)
+        for name in fresh._fields:
+            # a shared edge's value comes from another grid's linspace
+            np.testing.assert_allclose(getattr(cached, name), getattr(fresh, name), rtol = 1e-14, err_msg = name)
+
+def test_grids_reuse_the_edges_they_share():
+    cache = RefinementCache()
+    for n in nested_refinement(4, 100):
+        cache.values(f, 0, 1, n)
+    # 5 edges for n = 4, then only the new half of each finer grid
+    assert cache.evaluations == 5 + 4 + 8 + 16 + 32
+    cache.values(f, 0, 1, 6)
+    # edges 0, 3 and 6 of the n = 6 grid are edges of the n = 4 grid
+    assert cache.evaluations == 5 + 4 + 8 + 16 + 32 + 4
+
+def test_eviction_keeps_the_most_recently_used_grids():
+    cache = RefinementCache(max_grids = 3)
+    for n in [5, 7, 11]:
+        cache.values(f, 0, 1, n)
+    cache.values(f, 0, 1, 5)
+    cache.values(f, 0, 1, 13)
+    assert len(cache.grids) == 3
+    assert [key[3] for key in cache.grids] == [11, 5, 13]
+
+def test_fractional_sweep_cuts_off_the_last_slice():
+    slices = riemann_slices(f, 0, 5, 2.5, count = 4)
+    np.testing.assert_allclose(slices.left, [0, 2, 4, 5])
+    np.testing.assert_allclose(slices.right, [2, 4, 5, 5])
+    np.testing.assert_allclose(slices.heights, [2, 2, 1, 0])
+    np.testing.assert_allclose(slices.radii, [f(2), f(4), f(5), 0])
+
+def test_whole_sweep_step_matches_the_plain_grid():
+    swept = riemann_slices(f, 0, 5, 5.0, count = 5)
+    plain = riemann_slices(f, 0, 5, 5)
+    np.testing.assert_allclose(swept.radii, plain.radii)
+    np.testing.assert_allclose(swept.heights, plain.heights)
+
+def test_sweeps_stay_out_of_the_cache():
+    cache = RefinementCache(max_grids = 2)
+    cache.slices(f, 0, 5, 10)
+    cache.slices(f, 0, 5, 20)
+    cache.slices(f, 0, 5, 7.5, count = 8)
+    for b in np.linspace(1, 4, 30):
+        cache.slices(f, 0, b, 10, keep = False)
+    assert [key[3] for key in cache.grids] == [10, 20]
@@ -0,0 +1,70 @@
+import math
+
+import numpy as np
+import pytest
+
+from profiles import PROFILES
+import volumes
+
+f = PROFILES["disc"]
+g = lambda x: 0.5 * f(x)
+
+# the sums of volumes.METHODS one slice at a time, the way they're written
+# out at the top of volumes.py
+def naive_sum(function, a, b, n, method, inner = None):
+    dx = (b - a) / n
+    total = 0.0
+    for i in range(n):
+        left, right = a + i * dx, a + (i + 1) * dx
+        if method == "area":
+            total += function(right) * dx
+        elif method == "disc":
+            total += math.pi * function(right) ** 2 * dx
+        elif method == "washer":
+            total += math.pi * (function(right) ** 2 - inner(right) ** 2) * dx
+        elif method == "shell":
+            total += math.pi * (right ** 2 - left ** 2) * function(right)
+        else:
+            total += math.pi * (function(left) + function(right)) * math.hypot(dx, function(right) - function(left))
+    return total
+
+@pytest.mark.parametrize("method", volumes.METHODS)
+def test_riemann_sums_match_naive_loops(method):
+    subintervals = [1, 3, 10, 57]
+    inner = g if method == "washer" else None
+    sums = volumes.riemann_sums(f, 0, 5, subintervals, method, inner)
+    expected = [naive_sum(f, 0, 5, n, method, inner) for n in subintervals]
+    np.testing.assert_allclose(sums, expected, rtol = 1e-12)
+
+@pytest.mark.parametrize("method", ["area", "disc", "shell", "frustum"])
+def test_riemann_sums_converge_to_exact_value(method):
+    sums = volumes.riemann_sums(f, 0, 5, [10, 100, 10000], method)
+    exact = volumes.exact_value(f, 0, 5, method)
+    errors = np.abs(sums - exact)
+    assert errors[0] > errors[1] > errors[2]
+    assert errors[2] < 1e-3 * abs(exact)
+
+@pytest.mark.parametrize("subintervals", [2.5, [4, 7.5], 0])
+def test_fractional_or_empty_grids_raise(subintervals):
+    with pytest.raises(ValueError):
+        volumes.riemann_sums(f, 0, 5, subintervals)
+
+@pytest.mark.parametrize("processes", [1, 2])
+@pytest.mark.parametrize("method", ["disc", "frustum"])
+def test_streaming_sum_matches_riemann_sums(method, processes):
+    n = 10 ** 6
+    streamed = volumes.streaming_sum(f, 0, 5, n, method, chunk_size = 2 ** 17, processes = processes)
+    assert streamed == pytest.approx(volumes.riemann_sums(f, 0, 5, n, method)[0], rel = 1e-12)
+
+def test_convergence_orders_match_the_rules():
+    study = volumes.convergence_study(f, 0, 5, "disc", volumes.geometric_subintervals(16, 2, 6))
+    for rule, order in volumes.ORDERS.items():
+        np.testing.assert_allclose(study.orders[rule][-2:], order, atol = 0.1)
+        assert abs(study.extrapolated[rule][-1] - study.exact) < abs(study.sums[rule][-1] - study.exact)
+
+def test_refinement_stops_once_a_step_moves_less_than_a_pixel():
+    steps = range(6, 62, 5)
+    assert volumes.refinement_steps(f, 0, 5, "frustum", 5, steps, 1e-9) == list(steps)
+    stopped = volumes.refinement_steps(f, 0, 5, "frustum", 5, steps, 0.05)
+    assert stopped[-1] < 61
+    assert volumes.outline_change(f, 0, 5, stopped[-2], stopped[-1], "frustum") < 0.05
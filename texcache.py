@@ -0,0 +1,91 @@
+from concurrent.futures import ProcessPoolExecutor
+import json
+from pathlib import Path
+
+from manim import *
+from manim.mobject.text import tex_mobject
+from manim.utils.tex_file_writing import delete_nonsvg_files, tex_hash, tex_to_svg_file
+
+# every Tex / MathTex ends up as one tex_to_svg_file(expression, environment)
+# call (plus one per substring when it is split up), which runs latex and
+# dvisvgm one string at a time the first time a string is seen. the svgs are
+# cached in tex_dir by a hash of the file, so compiling the same strings
+# ahead of time in other processes makes those calls plain file lookups.
+#
+# the strings a scene needs are recorded while it renders and saved to
+# media_dir/tex_manifests/<scene>.json, and compiled in parallel before
+# construct on the next cold render. only strings typeset with the default
+# template are recorded
+
+_recorded = {}
+
+def _recording_tex_to_svg_file(expression, environment=None, tex_template=None):
+    if tex_template is None or tex_template is config.tex_template:
+        _recorded[(expression, environment)] = None
+    return tex_to_svg_file(expression, environment, tex_template)
+
+def start_recording():
+    _recorded.clear()
+    tex_mobject.tex_to_svg_file = _recording_tex_to_svg_file
+
+def stop_recording():
+    tex_mobject.tex_to_svg_file = tex_to_svg_file
+    return list(_recorded)
+
+# where generate_tex_file would write the .tex file (the .svg goes next to
+# it), without writing it
+def tex_file_path(expression, environment = None, tex_template = None):
+    tex_template = tex_template or config.tex_template
+    if environment is not None:
+        output = tex_template.get_texcode_for_expression_in_env(expression, environment)
+    else:
+        output = tex_template.get_texcode_for_expression(expression)
+    return config.get_dir("tex_dir") / (tex_hash(output) + ".tex")
+
+def is_compiled(expression, environment):
+    return tex_file_path(expression, environment).with_suffix(".svg").exists()
+
+def _init_worker(tex_dir, tex_template):
+    config.tex_dir = tex_dir
+    config.tex_template = tex_template
+    # another worker may still be using its .tex / .dvi files
+    config.no_latex_cleanup = True
+
+def _compile(job):
+    try:
+        return str(tex_to_svg_file(*job))
+    except Exception:
+        # the scene compiles it again and reports the error properly
+        return None
+
+# compile every (expression, environment) that isn't in tex_dir yet, using
+# processes workers (all cores by default). returns how many were compiled
+def precompile_tex(jobs, processes = None):
+    jobs = [job for job in dict.fromkeys(tuple(job) for job in jobs) if not is_compiled(*job)]
+    if not jobs:
+        return 0
+    logger.info(f"Compiling {len(jobs)} TeX strings in parallel")
+    with ProcessPoolExecutor(processes, initializer = _init_worker, initargs = (str(config.get_dir("tex_dir")), config.tex_template)) as pool:
+        failed = sum(svg_file is None for svg_file in pool.map(_compile, jobs))
+    if failed:
+        logger.warning(f"{failed} TeX strings failed to compile")
+    if not config.no_latex_cleanup:
+        delete_nonsvg_files()
+    return len(jobs) - failed
+
+def tex_manifest_path(scene_name):
+    return Path(config.media_dir) / "tex_manifests" / f"{scene_name}.json"
+
+def load_tex_manifest(scene_name):
+    path = tex_manifest_path(scene_name)
+    if not path.exists():
+        return []
+    return [tuple(job) for job in json.loads(path.read_text())]
+
+# adds jobs to what's already there, so a render that stops early doesn't
+# forget the strings after it
+def save_tex_manifest(scene_name, jobs):
+    jobs = list(dict.fromkeys(load_tex_manifest(scene_name) + [tuple(job) for job in jobs]))
+    path = tex_manifest_path(scene_name)
+    path.parent.mkdir(parents = True, exist_ok = True)
+    path.write_text(json.dumps(jobs, indent = 4))
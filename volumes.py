@@ -0,0 +1,284 @@
+from collections import namedtuple
+import math
+import multiprocessing
+import os
+
+import numpy as np
+
+from profiles import value_and_derivative
+from riemann import evaluate
+
+# the numbers the scenes only draw: Riemann sums of the solids for a whole
+# refinement sequence of n's at once, and the integrals they converge to.
+#
+# every method takes the profile f on [a, b] (and g, the inner profile, for
+# washers), with the slices the scenes build:
+#   "area": sum f(x_{i+1}) dx, the rectangles
+#   "disc": sum pi f(x_{i+1})^2 dx, discs about the x-axis
+#   "washer": sum pi (f(x_{i+1})^2 - g(x_{i+1})^2) dx
+#   "shell": sum pi (x_{i+1}^2 - x_i^2) f(x_{i+1}), hollow shells about the y-axis
+#   "frustum": sum pi (f(x_i) + f(x_{i+1})) sqrt(dx^2 + (f(x_{i+1}) - f(x_i))^2),
+#       the surface area of the truncated cones about the x-axis
+# (f is sampled at x_{i+1} there, and the frustum's radius is the average of
+# f(x_i) and f(x_{i+1}); see RULES for sampling elsewhere)
+METHODS = ("area", "disc", "washer", "shell", "frustum")
+
+# subintervals as an array of whole n's. a fractional n (the scenes' partial
+# last slice) has no sum here, and truncating it would quietly sum another n
+def grid_counts(subintervals):
+    subintervals = np.atleast_1d(np.asarray(subintervals))
+    if np.any(subintervals != np.floor(subintervals)):
+        raise ValueError(f"every n has to be a whole number, got {subintervals[subintervals != np.floor(subintervals)]}")
+    subintervals = subintervals.astype(int)
+    if np.any(subintervals < 1):
+        raise ValueError("every grid needs at least one subinterval")
+    return subintervals
+
+# the edges of every grid in subintervals, end to end: grid k's n_k + 1
+# edges are edges[offsets[k]:offsets[k + 1]], and is_left marks the edges
+# that start a slice (all but the last of each grid)
+def stacked_edges(a, b, subintervals):
+    subintervals = grid_counts(subintervals)
+    counts = subintervals + 1
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    index = np.arange(offsets[-1]) - np.repeat(offsets[:-1], counts)
+    n = np.repeat(subintervals, counts)
+    edges = np.where(index == n, b, a + (b - a) * index / n)
+    return edges, offsets, index < n
+
+# where each slice samples f (and g): its left edge, its right edge, its
+# middle, or the average of the left and right terms. the scenes sample the
+# right edge, and a frustum's radius is the average of both edges, so None
+# means "right", or "trapezoid" for frustums
+RULES = ("left", "right", "midpoint", "trapezoid")
+
+# the error of each rule goes down like 1 / n^order for smooth f
+ORDERS = {"left": 1, "right": 1, "midpoint": 2, "trapezoid": 2}
+
+def default_rule(method):
+    return "trapezoid" if method == "frustum" else "right"
+
+def _check(method, inner, rule):
+    if method not in METHODS:
+        raise ValueError(f"unknown method {method!r}, expected one of {METHODS}")
+    if method == "washer" and inner is None:
+        raise ValueError("washers need the inner profile")
+    if rule not in RULES:
+        raise ValueError(f"unknown rule {rule!r}, expected one of {RULES}")
+
+# what each slice adds to the sum of method, given its edges and f (and g for
+# washers) at its (left edge, right edge, middle), sampled where rule says.
+# the middle is only needed for "midpoint"
+def slice_terms(method, left, right, values, inner_values = None, rule = "right"):
+    if rule == "trapezoid":
+        return (
+            slice_terms(method, left, right, values, inner_values, "left")
+            + slice_terms(method, left, right, values, inner_values, "right")
+        ) / 2
+    sample = RULES.index(rule)
+    radius = values[sample]
+    width = right - left
+    if method == "area":
+        return radius * width
+    if method == "disc":
+        return np.pi * radius ** 2 * width
+    if method == "washer":
+        return np.pi * (radius ** 2 - inner_values[sample] ** 2) * width
+    if method == "shell":
+        return np.pi * (right ** 2 - left ** 2) * radius
+    return 2 * np.pi * radius * np.hypot(width, values[1] - values[0])
+
+# the slices of every grid in subintervals, end to end: their left and right
+# edges, f (and g, None without it) at (left edge, right edge, middle) of
+# each (middle only with midpoints, otherwise None), and the index of the
+# first slice of each grid
+def stacked_slices(function, a, b, subintervals, inner = None, midpoints = False):
+    subintervals = grid_counts(subintervals)
+    edges, offsets, is_left = stacked_edges(a, b, subintervals)
+    starts = is_left[:-1]
+    first_slices = np.concatenate([[0], np.cumsum(subintervals)[:-1]])
+    return (
+        edges[:-1][starts], edges[1:][starts],
+        _samples(function, edges, starts, midpoints), _samples(inner, edges, starts, midpoints),
+        first_slices,
+    )
+
+# profile at (left edge, right edge, middle) of the slices between edges
+# picked by keep
+def _samples(profile, edges, keep, midpoints):
+    if profile is None:
+        return None
+    left, right = edges[:-1][keep], edges[1:][keep]
+    at_edges = evaluate(profile, edges)
+    middle = evaluate(profile, (left + right) / 2) if midpoints else None
+    return at_edges[:-1][keep], at_edges[1:][keep], middle
+
+# the Riemann sum of method for every n in subintervals, as an array in the
+# same order. f (and g) is evaluated once over the edges of every grid
+# together, and the slices of all grids are summed with one reduceat
+def riemann_sums(function, a, b, subintervals, method = "disc", inner = None, rule = None):
+    rule = rule or default_rule(method)
+    _check(method, inner, rule)
+    left, right, values, inner_values, first_slices = stacked_slices(
+        function, a, b, subintervals, inner, midpoints = rule == "midpoint"
+    )
+    return np.add.reduceat(slice_terms(method, left, right, values, inner_values, rule), first_slices)
+
+# one sum for a single, very large n (10^6 to 10^9 and up), in constant
+# memory: the slices are taken chunk_size at a time, each chunk is summed
+# with numpy's pairwise sum and the chunks' sums are added up exactly with
+# math.fsum, so the rounding error doesn't grow with n the way a running
+# total's would. with processes > 1 (all cores for None) the chunks are
+# summed by forked worker processes, which inherit the function instead of
+# pickling it (profiles are lambdas)
+def streaming_sum(function, a, b, subintervals, method = "disc", inner = None, rule = None, chunk_size = 2 ** 20, processes = None):
+    global _stream
+    rule = rule or default_rule(method)
+    _check(method, inner, rule)
+    subintervals = int(grid_counts(subintervals)[0])
+    chunks = range(0, subintervals, chunk_size)
+    processes = processes or os.cpu_count() or 1
+    if "fork" not in multiprocessing.get_all_start_methods():
+        processes = 1
+
+    _stream = (function, a, b, subintervals, method, inner, rule, chunk_size)
+    try:
+        if processes < 2 or len(chunks) < 2:
+            partials = [_chunk_sum(start) for start in chunks]
+        else:
+            with multiprocessing.get_context("fork").Pool(processes) as pool:
+                partials = list(pool.imap_unordered(_chunk_sum, chunks, chunksize = max(1, len(chunks) // (8 * processes))))
+    finally:
+        _stream = None
+    return math.fsum(partials)
+
+# the sum being streamed, inherited through fork
+_stream = None
+
+def _chunk_sum(start):
+    function, a, b, subintervals, method, inner, rule, chunk_size = _stream
+    stop = min(start + chunk_size, subintervals)
+    index = np.arange(start, stop + 1, dtype=float)
+    edges = a + (b - a) * index / subintervals
+    if stop == subintervals:
+        edges[-1] = b
+    everything = slice(None)
+    midpoints = rule == "midpoint"
+    terms = slice_terms(
+        method, edges[:-1], edges[1:],
+        _samples(function, edges, everything, midpoints), _samples(inner, edges, everything, midpoints),
+        rule,
+    )
+    return float(np.sum(terms))
+
+# Gauss-Legendre nodes and weights on [-1, 1], shared by every integral
+_nodes, _weights = np.polynomial.legendre.leggauss(32)
+
+# the integral of integrand over [a, b] with composite Gauss-Legendre on
+# panels panels, all evaluated in one call. exact to rounding for the smooth
+# profiles the scenes use
+def integrate(integrand, a, b, panels = 32):
+    edges = np.linspace(a, b, panels + 1)
+    half = np.diff(edges)[:, None] / 2
+    x = (edges[:-1, None] + edges[1:, None]) / 2 + half * _nodes
+    return float(np.sum(half * _weights * evaluate(integrand, x)))
+
+# what riemann_sums converges to as n goes to infinity. for "frustum", f' is
+# the profile's own derivative if it was given one, otherwise it comes out of
+# one pass of function over dual numbers, so function has to be written with
+# numpy
+def exact_value(function, a, b, method = "disc", inner = None):
+    if method == "area":
+        integrand = function
+    elif method == "disc":
+        integrand = lambda x: np.pi * evaluate(function, x) ** 2
+    elif method == "washer":
+        if inner is None:
+            raise ValueError("washers need the inner profile")
+        integrand = lambda x: np.pi * (evaluate(function, x) ** 2 - evaluate(inner, x) ** 2)
+    elif method == "shell":
+        integrand = lambda x: 2 * np.pi * x * evaluate(function, x)
+    elif method == "frustum":
+        def integrand(x):
+            values, slopes = value_and_derivative(function, x)
+            return 2 * np.pi * values * np.sqrt(1 + slopes ** 2)
+    else:
+        raise ValueError(f"unknown method {method!r}, expected one of {METHODS}")
+    return integrate(integrand, a, b)
+
+# a convergence study of the sums of method over subintervals, a geometric
+# sequence of n's (every n the last times the same ratio):
+#   sums: {rule: the sum for every n}
+#   orders: {rule: the order of convergence the sums show, from each three
+#       consecutive n's, log(|S_k - S_{k-1}| / |S_{k+1} - S_k|) / log(ratio).
+#       this only holds when the ratio is constant: for anything else it's
+#       an estimate, using n_{k+1} / n_k as the ratio}
+#   extrapolated: {rule: the Richardson extrapolation of each two
+#       consecutive sums, (r^p S_{k+1} - S_k) / (r^p - 1) with p the rule's
+#       order and r = n_{k+1} / n_k}
+#   exact: exact_value
+Convergence = namedtuple("Convergence", ["subintervals", "sums", "orders", "extrapolated", "exact"])
+
+def geometric_subintervals(start = 2, ratio = 2, count = 12):
+    return start * ratio ** np.arange(count)
+
+# every rule of rules over every n, with f (and g) evaluated once, at the
+# edges and middles of every grid together
+def convergence_study(function, a, b, method = "disc", subintervals = None, inner = None, rules = RULES):
+    for rule in rules:
+        _check(method, inner, rule)
+    subintervals = grid_counts(geometric_subintervals() if subintervals is None else subintervals)
+    left, right, values, inner_values, first_slices = stacked_slices(
+        function, a, b, subintervals, inner, midpoints = "midpoint" in rules
+    )
+    sums = {
+        rule: np.add.reduceat(slice_terms(method, left, right, values, inner_values, rule), first_slices)
+        for rule in rules
+    }
+
+    ratios = subintervals[1:] / subintervals[:-1]
+    orders, extrapolated = {}, {}
+    for rule, rule_sums in sums.items():
+        steps = np.abs(np.diff(rule_sums))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            orders[rule] = np.log(steps[:-1] / steps[1:]) / np.log(ratios[1:])
+        factor = ratios ** ORDERS[rule]
+        extrapolated[rule] = (factor * rule_sums[1:] - rule_sums[:-1]) / (factor - 1)
+
+    return Convergence(subintervals, sums, orders, extrapolated, exact_value(function, a, b, method, inner))
+
+# the tops of the slices the scenes draw of profile with n slices, at x:
+# steps at f(x_{i+1}) for every method but "frustum", whose slices run
+# straight from f(x_i) to f(x_{i+1})
+def slice_outline(profile, a, b, n, x, method):
+    edges = np.linspace(a, b, n + 1)
+    values = evaluate(profile, edges)
+    if method == "frustum":
+        return np.interp(x, edges, values)
+    return values[np.clip(np.ceil((x - a) / (b - a) * n), 1, n).astype(int)]
+
+# the most the top of any slice (of f, or of g for washers) moves going from
+# n slices to m. both outlines are straight or flat between the edges of
+# either grid, so checking the edges and the middles between them is exact
+def outline_change(function, a, b, n, m, method, inner = None):
+    x = np.union1d(np.linspace(a, b, n + 1), np.linspace(a, b, m + 1))
+    x = np.concatenate([x, (x[:-1] + x[1:]) / 2])
+    change = 0.0
+    for profile in (function, inner):
+        if profile is not None:
+            change = max(change, float(np.max(np.abs(
+                slice_outline(profile, a, b, n, x, method) - slice_outline(profile, a, b, m, x, method)
+            ))))
+    return change
+
+# the n's of steps up to the first where no slice's top moves by a pixel or
+# more from the step before (start, the n on screen before the montage, for
+# the first): where a refinement montage stops looking any different. all of
+# steps if none is. pixel_size is how much of f's units a pixel covers, see
+# slices.pixel_size
+def refinement_steps(function, a, b, method, start, steps, pixel_size, inner = None):
+    steps = list(steps)
+    for i, (n, m) in enumerate(zip([start, *steps], steps)):
+        if outline_change(function, a, b, n, m, method, inner) < pixel_size:
+            return steps[:i + 1]
+    return steps